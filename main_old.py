@@ -1,79 +1,269 @@
-import sys
+import heapq
+import mmap
+import os
 import re
+import sys
+import threading
 import webbrowser
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QPushButton, QWidget, QFileDialog,
     QMenuBar, QMenu, QDialog, QListWidget, QHBoxLayout, QTextEdit, QLabel, QLineEdit
 )
-from PyQt6.QtGui import QAction, QTextCursor
-from PyQt6.QtCore import Qt, QPoint, QRect
+from PyQt6.QtGui import QAction, QColor, QTextCharFormat, QTextCursor
+from PyQt6.QtCore import Qt, QPoint, QRect, QTimer, QObject, QThread, pyqtSignal, pyqtSlot
+from collections import defaultdict
 from functools import partial
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
 import keyboard  # Global hotkey library
 
 
+# Maximum number of lines kept in each tag section
+MAX_SECTION_BLOCKS = 500
+
+# How often LogWorker checks the log for appended data. Each tick is one
+# fstat of the open handle; everything written since the last tick is read
+# and scanned in one go.
+POLL_INTERVAL_MS = 100
+
+# Keep the log open between polls instead of reopening it for every read.
+# Not on Windows: an open handle there stops the game from moving Game.log
+# into logbackups when a new session starts.
+KEEP_HANDLE_OPEN = os.name != "nt"
+
+# Tags shown until the user edits them in the tag manager; their encoded
+# forms are built once at import so _recompile only encodes user-added tags
+DEFAULT_TAGS = ("<Actor Death>", "<Corpse>", "<Jump Drive Changing State>")
+_DEFAULT_TAG_LITERALS = {tag: tag.encode("utf-8") for tag in DEFAULT_TAGS}
+
+
 # LogFileMonitor Class: Tracks file changes and processes logs
-class LogFileMonitor(FileSystemEventHandler):
+class LogFileMonitor:
     def __init__(self, callback, tags=None):
-        super().__init__()
-        self.callback = callback
+        self.callback = callback  # Called with each batch of (tag, line) pairs
         self.filepath = None
         self.file_offset = 0
         self.tags = tags or []
+        self._fh = None  # See KEEP_HANDLE_OPEN
+        self._tail = b""  # Read but unterminated last line, completed by a later read
+        # Reads run on the LogWorker thread; close() comes from the GUI thread
+        self._lock = threading.RLock()
+        self._literals = []
+        self._tag_regex = None
+        self._tag_by_literal = {}
+        self._tag_order = []
+        self._recompile()
+
+    def set_tags(self, tags):
+        with self._lock:
+            self.tags = tags
+            self._recompile()
+
+    def _recompile(self):
+        # Tags are plain literals: per-line checks use `in` and single-tag
+        # sweeps use bytes.find (CPython's tuned substring search).
+        # Encoded once per tag-set change, not once per line.
+        self._tag_order = list(self.tags)
+        self._literals = [(_DEFAULT_TAG_LITERALS.get(tag) or tag.encode("utf-8"), tag)
+                          for tag in self._tag_order if tag]
+
+        # All tags as one alternation, so a full-buffer scan is a single
+        # finditer pass in C. Shortest first: where one tag is a prefix of
+        # another, the shorter wins at a shared offset, as in find_tags'
+        # per-literal merge.
+        self._tag_by_literal = {literal: tag for literal, tag in self._literals}
+        self._tag_regex = None
+        if self._literals:
+            ordered = sorted(self._tag_by_literal, key=len)
+            self._tag_regex = re.compile(b"|".join(re.escape(literal) for literal in ordered))
 
     def set_filepath(self, filepath):
-        self.filepath = filepath
-        self.file_offset = 0
-        self.read_existing_file()
+        with self._lock:
+            self.filepath = filepath
+            self.file_offset = 0
+            self.read_existing_file()
 
     def read_existing_file(self):
         if not self.filepath:
             return
+        with self._lock:
+            try:
+                self._reopen()
+                # Map the file instead of reading it: the scan runs straight
+                # over the page cache with no copy into the Python heap. The
+                # map is closed straight after, as a live one would stop the
+                # game truncating or rotating the log on Windows.
+                if os.fstat(self._fh.fileno()).st_size:
+                    with mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        self.file_offset = len(mm)
+                        limit = mm.rfind(b"\n") + 1
+                        self._tail = mm[limit:]
+                        self.emit_pairs(self.scan_buffer(mm, limit=limit))
+                if not KEEP_HANDLE_OPEN:
+                    self.close()
+            except Exception as e:
+                print(f"Error while reading file: {e}")
+
+    def read_new_data(self):
+        with self._lock:
+            self._read_new_data()
+
+    def _reopen(self):
+        self.close()
+        self._fh = open(self.filepath, "rb")
+        self.file_offset = 0
+        self._tail = b""
+
+    def _is_replaced(self):
+        # A new file at the same path (rotation) has a different inode/file id
+        path_stat = os.stat(self.filepath)
+        handle_stat = os.fstat(self._fh.fileno())
+        return (path_stat.st_ino, path_stat.st_dev) != (handle_stat.st_ino, handle_stat.st_dev)
+
+    def close(self):
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    def _read_new_data(self):
         try:
-            with open(self.filepath, "r") as file:
-                for line in file:
-                    self.process_line(line.strip())
-                self.file_offset = file.tell()
+            if not KEEP_HANDLE_OPEN:
+                # Reopened for every read; a shrunk file shows a new session
+                with open(self.filepath, "rb") as fh:
+                    self._read_from(fh)
+                return
+            if self._fh is None or self._is_replaced():
+                self._reopen()
+            self._read_from(self._fh)
+        except FileNotFoundError:
+            pass  # Log is mid-rotation; the next poll picks up the new file
         except Exception as e:
-            print(f"Error while reading file: {e}")
+            print(f"Error while reading new changes: {e}")
+
+    def _read_from(self, fh):
+        size = os.fstat(fh.fileno()).st_size
+        if size < self.file_offset:
+            # Log was truncated (new game session): start over
+            self.file_offset = 0
+            self._tail = b""
+        elif size == self.file_offset:
+            # Nothing appended since the last poll
+            return
+        fh.seek(self.file_offset)
+        buf = fh.read()
+        self.file_offset = fh.tell()
+        if self._tail:
+            buf = self._tail + buf
+        # Only complete lines are scanned; a line still being written is
+        # kept until its newline arrives
+        limit = buf.rfind(b"\n") + 1
+        self._tail = buf[limit:]
+        self.emit_pairs(self.scan_buffer(buf, limit=limit))
+
+    def find_tags(self, buf, literals=None, limit=None):
+        """Yield (start, end, tag) for each tag occurrence in buf[:limit]."""
+        if limit is None:
+            limit = len(buf)
+        if literals is None:
+            # Regex over the bytes in place: buf may be the whole mapped log,
+            # so never decode or copy it
+            if self._tag_regex is not None:
+                tag_by_literal = self._tag_by_literal
+                for match in self._tag_regex.finditer(buf, 0, limit):
+                    yield match.start(), match.end(), tag_by_literal[match.group()]
+            return
+        # One bytes.find sweep per tag, merged back into buffer order
+        yield from heapq.merge(*(self._find_literal(buf, lit, tag, limit) for lit, tag in literals))
+
+    @staticmethod
+    def _find_literal(buf, literal, tag, limit):
+        start = buf.find(literal, 0, limit)
+        while start != -1:
+            end = start + len(literal)
+            yield start, end, tag
+            start = buf.find(literal, end, limit)
+
+    def scan_buffer(self, buf, literals=None, limit=None):
+        """Return (tag, line) pairs for every tagged line in buf[:limit], in order."""
+        if literals is None and not self._literals:
+            return []  # Every tag was removed; nothing can match
+        pairs = []
+        line_end = -1
+        if limit is None:
+            limit = len(buf)
+        for start, end, tag in self.find_tags(buf, literals, limit):
+            if start < line_end:
+                continue  # Only the first tag on a line counts
+            line_start = buf.rfind(b"\n", 0, start) + 1
+            line_end = buf.find(b"\n", end, limit)
+            if line_end == -1:
+                line_end = limit
+            line = buf[line_start:line_end].strip().decode("utf-8", "replace")
+            pairs.append((tag, line))
+        return pairs
+
+    def emit_pairs(self, pairs):
+        if pairs:
+            self.callback(pairs)
 
-    def on_modified(self, event):
-        if self.filepath and event.src_path == self.filepath:
+    def reparse_log_file(self, tag_name=None):
+        # Back-fill from the file rather than a copy kept in memory: one pass
+        # over a fresh read-only map of everything read so far
+        literals = [(tag_name.encode("utf-8"), tag_name)] if tag_name else None
+        with self._lock:
+            # Complete lines only; the tail has not been scanned yet
+            length = self.file_offset - len(self._tail)
+            if not self.filepath or length <= 0:
+                return
             try:
-                with open(self.filepath, "r") as file:
-                    file.seek(self.file_offset)
-                    for line in file:
-                        self.process_line(line.strip())
-                    self.file_offset = file.tell()
+                with open(self.filepath, "rb") as fh:
+                    if os.fstat(fh.fileno()).st_size < self.file_offset:
+                        return  # Truncated since the last read; the next poll starts over
+                    with mmap.mmap(fh.fileno(), length, access=mmap.ACCESS_READ) as mm:
+                        self.emit_pairs(self.scan_buffer(mm, literals))
             except Exception as e:
-                print(f"Error while reading new changes: {e}")
+                print(f"Error reparsing log file: {e}")
 
-    def process_line(self, line):
-        for tag in self.tags:
-            if re.search(re.escape(tag), line):
-                self.callback(tag, line)
-                break
 
-    def reparse_log_file(self, tag_name=None):
-        if not self.filepath:
-            return
-        try:
-            with open(self.filepath, "r") as file:
-                lines = file.readlines()
-            if tag_name:
-                tag_lines = [line.strip() for line in lines if re.search(re.escape(tag_name), line)]
-                for line in tag_lines:
-                    self.callback(tag_name, line)
-            else:
-                for line in lines:
-                    self.process_line(line.strip())
-        except Exception as e:
-            print(f"Error reparsing log file: {e}")
+# LogWorker Class: Runs full-file scans off the GUI thread
+class LogWorker(QObject):
+    # Emitted from the worker thread; Qt queues them to the GUI
+    sig_events = pyqtSignal(list)
+
+    def __init__(self, tags=None):
+        super().__init__()
+        self.monitor = LogFileMonitor(self.sig_events.emit, tags)
+        # Parented so it moves to the worker thread along with this object
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(POLL_INTERVAL_MS)
+        self._poll_timer.timeout.connect(self.poll)
+
+    @pyqtSlot()
+    def poll(self):
+        self.monitor.read_new_data()
+
+    @pyqtSlot(str)
+    def set_filepath(self, filepath):
+        self.monitor.set_filepath(filepath)
+        # Started from this slot so the timer runs on the worker thread
+        self._poll_timer.start()
+
+    @pyqtSlot(list)
+    def set_tags(self, tags):
+        self.monitor.set_tags(tags)
+
+    @pyqtSlot(str)
+    def reparse(self, tag_name):
+        # An empty tag name reparses every tag
+        self.monitor.reparse_log_file(tag_name or None)
 
 
 # OverlayWindow Class: Main Application Window
 class OverlayWindow(QMainWindow):
+    # Requests handled by LogWorker on its own thread
+    request_filepath = pyqtSignal(str)
+    request_reparse = pyqtSignal(str)
+    request_tags = pyqtSignal(list)
+
     def __init__(self):
         super().__init__()
         # Enable frameless design
@@ -93,7 +283,7 @@ class OverlayWindow(QMainWindow):
         self.setMinimumSize(400, 300)
 
         # Tags and colors
-        self.tags = ["<Actor Death>", "<Corpse>", "<Jump Drive Changing State>"]
+        self.tags = list(DEFAULT_TAGS)
         self.tag_colors = {
             "<Actor Death>": "orange",
             "<Corpse>": "yellow",
@@ -102,6 +292,15 @@ class OverlayWindow(QMainWindow):
 
         # Dictionary to hold log sections by tag
         self.log_sections = {}
+        # Text colour per tag, built once when its section is created
+        self._char_formats = {}
+
+        # Events are queued per tag and written to the sections in bursts
+        self._pending = defaultdict(list)
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(50)
+        self._flush_timer.timeout.connect(self.flush_pending)
 
         # Central widget and layout
         self.central_widget = QWidget()
@@ -260,6 +459,9 @@ class OverlayWindow(QMainWindow):
             text_edit, container = self.create_scrollable_section(tag)
             self.layout.insertWidget(self.layout.count() - 1, container)
             self.log_sections[tag] = text_edit
+            char_format = QTextCharFormat()
+            char_format.setForeground(QColor(self.tag_colors.get(tag, "white")))
+            self._char_formats[tag] = char_format
 
     def create_scrollable_section(self, tag):
         container = QWidget()
@@ -270,6 +472,9 @@ class OverlayWindow(QMainWindow):
         container_layout.addWidget(title)
         text_edit = QTextEdit()
         text_edit.setReadOnly(True)
+        text_edit.setUndoRedoEnabled(False)
+        # Qt evicts the oldest blocks itself once a section reaches the cap
+        text_edit.document().setMaximumBlockCount(MAX_SECTION_BLOCKS)
         text_edit.setStyleSheet("""
             background-color: black;
             color: white;
@@ -279,36 +484,77 @@ class OverlayWindow(QMainWindow):
         container_layout.addWidget(text_edit)
         return text_edit, container
 
-    def update_log_section(self, tag, message):
-        if tag in self.log_sections:
-            text_edit = self.log_sections[tag]
-            text_edit.moveCursor(QTextCursor.MoveOperation.End)
-            color = self.tag_colors.get(tag, "white")
-            text_edit.append(f"<span style='color:{color}'>{message}</span>")
-
     def clear_logs(self, tag):
         if tag in self.log_sections:
             self.log_sections[tag].clear()
 
     def start_file_watcher(self):
-        self.log_monitor = LogFileMonitor(self.add_event, self.tags)
-        self.observer = Observer()
-        self.observer.schedule(self.log_monitor, ".", recursive=False)
-        self.observer.start()
-
-    def add_event(self, category, event_text):
-        self.update_log_section(category, event_text)
+        # All file scanning, including polling the log for appended data,
+        # runs on worker_thread. Results reach the GUI thread only through
+        # queued signals.
+        self.worker_thread = QThread(self)
+        self.log_worker = LogWorker(self.tags)
+        self.log_worker.moveToThread(self.worker_thread)
+        self.log_monitor = self.log_worker.monitor
+        self.log_worker.sig_events.connect(self.add_events, Qt.ConnectionType.QueuedConnection)
+        self.request_filepath.connect(self.log_worker.set_filepath)
+        self.request_reparse.connect(self.log_worker.reparse)
+        self.request_tags.connect(self.log_worker.set_tags)
+        self.worker_thread.start()
+
+    def add_events(self, pairs):
+        for tag, message in pairs:
+            self._pending[tag].append(message)
+        self.schedule_flush()
+
+    def schedule_flush(self):
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush_pending(self):
+        # One edit block (and so one layout pass) per section per burst.
+        # Each message gets its own text block so the block cap applies.
+        pending, self._pending = self._pending, defaultdict(list)
+        for tag, messages in pending.items():
+            if tag in self.log_sections:
+                self.append_lines(tag, messages)
+
+    def append_lines(self, tag, messages):
+        text_edit = self.log_sections[tag]
+        char_format = self._char_formats[tag]
+        document = text_edit.document()
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        # textChanged etc. would fire per insert; nothing listens, and
+        # one repaint after the burst is enough
+        text_edit.blockSignals(True)
+        cursor.beginEditBlock()
+        for message in messages:
+            if not document.isEmpty():
+                cursor.insertBlock()
+            # Plain text with a per-tag format: no HTML parsing, and the
+            # log's own <Tag> markers need no escaping
+            cursor.insertText(message, char_format)
+        cursor.endEditBlock()
+        text_edit.blockSignals(False)
+        text_edit.viewport().update()
+        # Follow the newest line once per call, not once per message
+        scroll_bar = text_edit.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.maximum())
 
     def open_tag_manager(self):
         dialog = TagManagerDialog(self, self.tags)
         if dialog.exec():
             self.tags = dialog.tags
-            self.log_monitor.tags = self.tags
-            self.reparse_log_file()
+            self.request_tags.emit(list(self.tags))
             self.update_ui_for_tags()
 
-    def reparse_log_file(self):
-        self.log_monitor.read_existing_file()
+    def add_new_tag_and_update(self, tag):
+        # Called by TagManagerDialog: fill only the new section from memory
+        # Queued ahead of the reparse, so the worker has the new tag first
+        self.request_tags.emit(list(self.tags))
+        self.add_tag_section(tag)
+        self.request_reparse.emit(tag)
 
     def update_ui_for_tags(self):
         current_tags = set(self.log_sections.keys())
@@ -317,10 +563,13 @@ class OverlayWindow(QMainWindow):
             self.remove_tag_section(tag)
         for tag in new_tags - current_tags:
             self.add_tag_section(tag)
+            # Fill the new section with what the log already holds
+            self.request_reparse.emit(tag)
 
     def remove_tag_section(self, tag):
         if tag in self.log_sections:
             text_edit = self.log_sections.pop(tag)
+            self._char_formats.pop(tag, None)
             container = text_edit.parentWidget()
             self.layout.removeWidget(container)
             container.deleteLater()
@@ -328,13 +577,15 @@ class OverlayWindow(QMainWindow):
     def choose_file(self):
         filepath, _ = QFileDialog.getOpenFileName(self, "Select Log File")
         if filepath:
+            self._pending.clear()
             for text_edit in self.log_sections.values():
                 text_edit.clear()
-            self.log_monitor.set_filepath(filepath)
+            self.request_filepath.emit(filepath)
 
     def close_application(self):
-        self.observer.stop()
-        self.observer.join()
+        self.worker_thread.quit()
+        self.worker_thread.wait()
+        self.log_monitor.close()
         QApplication.quit()
 
 
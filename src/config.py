@@ -7,12 +7,13 @@ Persists settings to JSON file alongside the executable.
 
 import json
 import os
+import tempfile
 from dataclasses import dataclass, field, asdict
 from typing import Optional
 
 CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sc_parse_config.json")
 
-@dataclass
+@dataclass(slots=True)
 class OverlayConfig:
     """Overlay window configuration."""
     x: int = 20
@@ -24,7 +25,7 @@ class OverlayConfig:
     max_feed_items: int = 50
     compact_mode: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Root application config."""
     # Log file
@@ -70,8 +71,27 @@ class Config:
     def save(self):
         """Persist config to disk."""
         try:
-            data = asdict(self)
-            with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
+            write_config(self.dumps())
         except Exception as e:
             print(f"[Config] Failed to save config: {e}")
+
+    def dumps(self) -> str:
+        """Serialize config to the JSON text save() writes."""
+        return json.dumps(asdict(self), indent=2)
+
+
+def write_config(text: str):
+    """Write serialized config to CONFIG_FILE, replacing it atomically so a
+    crash mid-write never leaves a truncated file behind."""
+    # A fresh temp file per write, so two writers never share one
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(CONFIG_FILE), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, CONFIG_FILE)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -7,10 +7,15 @@ Inspired by StarLogs event_parser.py patterns, adapted for overlay use.
 """
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional, List
+from typing import Callable, Optional, List
+
+try:
+    import ahocorasick  # Optional: pyahocorasick, one-pass multi-substring search
+except ImportError:
+    ahocorasick = None
 
 
 class EventType(Enum):
@@ -29,7 +34,7 @@ class EventType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class GameEvent:
     """A parsed game event."""
     event_type: EventType
@@ -56,6 +61,16 @@ class GameEvent:
     is_player_involved: bool = False  # True if the configured player is killer or victim
 
 
+@dataclass(slots=True)
+class ParserContext:
+    """Per-player parser state, built once and reused for every line."""
+    player_name: Optional[str] = None
+    player_lower: Optional[str] = field(init=False, default=None)
+
+    def __post_init__(self):
+        self.player_lower = self.player_name.lower() if self.player_name else None
+
+
 # Known NPC name patterns (NPCs contain these substrings)
 NPC_PATTERNS = [
     "NPC_", "npc_", "PU_", "pu_", "Kopion", "Pirate", "Criminal", "Guard",
@@ -89,15 +104,45 @@ SHIP_LOOKUP = {
 }
 
 
-def is_npc(name: str) -> bool:
-    """Check if a name looks like an NPC."""
+# Lookup keys prepared once at import rather than on every call
+_SHIP_LOOKUP_LOWER = tuple((key.lower(), name) for key, name in SHIP_LOOKUP.items())
+_VEHICLE_PREFIXES = tuple((prefix + "_", mfr) for prefix, mfr in VEHICLE_NAMES.items())
+
+# One-pass ship key search when pyahocorasick is available. Values carry the
+# key's SHIP_LOOKUP position, since that order (not match position) decides
+# which ship wins when several keys occur.
+_SHIP_AUTOMATON = None
+if ahocorasick is not None:
+    _SHIP_AUTOMATON = ahocorasick.Automaton()
+    for _rank, (_key, _name) in enumerate(_SHIP_LOOKUP_LOWER):
+        _SHIP_AUTOMATON.add_word(_key, (_rank, _name))
+    _SHIP_AUTOMATON.make_automaton()
+
+# NPC_PATTERNS lowercased once (duplicates like "NPC_"/"npc_" collapse), and
+# built into an Aho–Corasick automaton when pyahocorasick is available
+_NPC_PATTERNS_LOWER = tuple(dict.fromkeys(p.lower() for p in NPC_PATTERNS))
+
+_NPC_AUTOMATON = None
+if ahocorasick is not None:
+    _NPC_AUTOMATON = ahocorasick.Automaton()
+    for _pattern in _NPC_PATTERNS_LOWER:
+        _NPC_AUTOMATON.add_word(_pattern, _pattern)
+    _NPC_AUTOMATON.make_automaton()
+
+
+def is_npc(name: str, lowered: Optional[str] = None) -> bool:
+    """Check if a name looks like an NPC. Pass `lowered` if name.lower() is already known."""
     if not name:
         return False
-    for pattern in NPC_PATTERNS:
-        if pattern.lower() in name.lower():
+    if lowered is None:
+        lowered = name.lower()
+    if _NPC_AUTOMATON is not None:
+        if next(_NPC_AUTOMATON.iter(lowered), None) is not None:
             return True
+    elif any(pattern in lowered for pattern in _NPC_PATTERNS_LOWER):
+        return True
     # Names with underscores and numbers are often NPCs
-    if re.match(r'^[A-Za-z]+_[A-Za-z]+_\d+', name):
+    if RE_NPC_NUMBERED.match(name):
         return True
     return False
 
@@ -106,12 +151,18 @@ def extract_ship_name(zone_or_id: str) -> Optional[str]:
     """Extract a friendly ship name from a zone string or vehicle ID."""
     if not zone_or_id:
         return None
-    for key, name in SHIP_LOOKUP.items():
-        if key.lower() in zone_or_id.lower():
-            return name
+    lowered = zone_or_id.lower()
+    if _SHIP_AUTOMATON is not None:
+        found = min((value for _end, value in _SHIP_AUTOMATON.iter(lowered)), default=None)
+        if found is not None:
+            return found[1]
+    else:
+        for key, name in _SHIP_LOOKUP_LOWER:
+            if key in lowered:
+                return name
     # Try manufacturer prefix
-    for prefix, mfr in VEHICLE_NAMES.items():
-        if zone_or_id.startswith(prefix + "_"):
+    for prefix, mfr in _VEHICLE_PREFIXES:
+        if zone_or_id.startswith(prefix):
             remainder = zone_or_id.split("_")[1] if "_" in zone_or_id else ""
             return f"{mfr} {remainder}".strip()
     return None
@@ -120,18 +171,21 @@ def extract_ship_name(zone_or_id: str) -> Optional[str]:
 def extract_timestamp(line: str) -> str:
     """Extract timestamp from log line, or return current time."""
     # SC log format: <2025-12-01T14:30:22.123Z> ...
-    match = re.match(r'<(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})', line)
+    # The log already writes HH:MM:SS, so no datetime round-trip is needed
+    match = RE_TIMESTAMP.match(line)
     if match:
-        try:
-            dt = datetime.fromisoformat(match.group(1))
-            return dt.strftime("%H:%M:%S")
-        except ValueError:
-            pass
+        return match.group(1)
     return datetime.now().strftime("%H:%M:%S")
 
 
 # ─── Regex patterns for Star Citizen Game.log ──────────────────────────────
 
+# Line timestamp, e.g. <2025-12-01T14:30:22.123Z>; captures the time of day
+RE_TIMESTAMP = re.compile(r'<\d{4}-\d{2}-\d{2}T(\d{2}:\d{2}:\d{2})')
+
+# Generated NPC names such as Pirate_Grunt_042
+RE_NPC_NUMBERED = re.compile(r'^[A-Za-z]+_[A-Za-z]+_\d+')
+
 # Actor Death: the main kill/death event
 # Format: <Actor Death> CActor::Kill: 'VictimName' [vehicleID] in zone 'ZoneName' killed by 'KillerName' [vehicleID] with damage type 'DamageType' ...
 RE_ACTOR_DEATH = re.compile(
@@ -196,27 +250,143 @@ RE_DIRECTION = re.compile(
     , re.IGNORECASE
 )
 
+# All event patterns combined into one alternation, matched from the start of
+# the line.  Each alternative skips ahead lazily (.*?) on its own, so all of
+# one pattern's positions are tried before the next pattern: the first
+# pattern to match anywhere in the line wins, as when they were searched one
+# by one, not the leftmost match.  The named group that matched
+# (match.lastgroup) says which event it is, and that pattern's own groups
+# follow its named group in numbering.
+EVENT_PATTERNS = {
+    "actor_death": RE_ACTOR_DEATH,
+    "actor_death_alt": RE_ACTOR_DEATH_ALT,
+    "vehicle_destroy": RE_VEHICLE_DESTROY,
+    "vehicle_destroy_alt": RE_VEHICLE_DESTROY_ALT,
+    "corpse": RE_CORPSE,
+    "jump": RE_JUMP,
+    "disconnect": RE_DISCONNECT,
+    "stall": RE_STALL,
+}
+
 
-def parse_line(line: str, player_name: Optional[str] = None) -> Optional[GameEvent]:
+# Extra case-sensitive condition on the whole line for a pattern to count.
+# The fallback vehicle pattern only applies to the tag as the game writes it.
+PATTERN_GUARDS = {
+    "vehicle_destroy_alt": "(?=(?-i:.*?<Vehicle Destruction>))",
+}
+
+
+def _compile_events(kinds) -> re.Pattern:
+    return re.compile(
+        "|".join(f"{PATTERN_GUARDS.get(kind, '')}.*?(?P<{kind}>{EVENT_PATTERNS[kind].pattern})"
+                 for kind in kinds)
+        , re.IGNORECASE
+    )
+
+
+RE_EVENT = _compile_events(EVENT_PATTERNS)
+
+# Every event pattern requires one of its substrings (case-insensitively),
+# so a line containing none of them cannot match and skips the regex.
+# They're searched as one case-insensitive alternation, so lines are never
+# lowercased.
+PATTERN_SENTINELS = {
+    "actor_death": ("<actor death>",),
+    "actor_death_alt": ("<actor death>",),
+    "vehicle_destroy": ("<vehicle destruction>",),
+    "vehicle_destroy_alt": ("<vehicle destruction>",),
+    "corpse": ("<corpse>",),
+    "jump": ("<jump drive changing state>",),
+    "disconnect": ("disconnect", "cnetworkerror"),
+    "stall": ("<actor stall>", "actorstall"),
+}
+
+
+def _sentinels(kinds) -> re.Pattern:
+    literals = dict.fromkeys(s for kind in kinds for s in PATTERN_SENTINELS[kind])
+    # The lookahead on first characters lets search() pass over most
+    # positions without trying every alternative there
+    first = "".join(sorted({re.escape(s[0]) for s in literals}))
+    return re.compile(f"(?=[{first}])(?:{'|'.join(map(re.escape, literals))})", re.IGNORECASE)
+
+
+EVENT_SENTINELS = _sentinels(EVENT_PATTERNS)
+
+# Config.show_* filters that need each pattern; a pattern is parsed if any of
+# them is on. Actor stalls have no filter and are always parsed.
+PATTERN_FILTERS = {
+    "actor_death": ("show_pvp_kills", "show_pve_kills", "show_deaths", "show_suicides"),
+    "actor_death_alt": ("show_pvp_kills", "show_pve_kills", "show_deaths", "show_suicides"),
+    "vehicle_destroy": ("show_vehicle_destroyed",),
+    "vehicle_destroy_alt": ("show_vehicle_destroyed",),
+    "corpse": ("show_corpses",),
+    "jump": ("show_jumps",),
+    "disconnect": ("show_disconnects",),
+    "stall": (),
+}
+
+
+def parse_line(line: str, player_name: Optional[str] = None,
+               ctx: Optional[ParserContext] = None) -> Optional[GameEvent]:
     """
     Parse a single log line and return a GameEvent if it matches a known pattern.
     Returns None for unrecognized lines.
+    The line should already be stripped; LogMonitor does that as it reads.
+    Callers parsing many lines for one player can pass a ParserContext instead
+    of player_name.
     """
+    return _parse_event(line, RE_EVENT, EVENT_SENTINELS, player_name, ctx)
+
+
+def build_parser(config) -> Callable[[str], Optional[GameEvent]]:
+    """
+    Build a parse_line specialised to a Config: event patterns that only feed
+    disabled show_* filters are left out of the regex and the prefilter.
+    Rebuild it when the filters or the player name change.
+    """
+    kinds = [kind for kind, filters in PATTERN_FILTERS.items()
+             if not filters or any(getattr(config, flag) for flag in filters)]
+    if len(kinds) == len(EVENT_PATTERNS):
+        regex, sentinels = RE_EVENT, EVENT_SENTINELS
+    else:
+        regex, sentinels = _compile_events(kinds), _sentinels(kinds)
+    ctx = ParserContext(config.player_name)
+
+    def parse(line: str) -> Optional[GameEvent]:
+        return _parse_event(line, regex, sentinels, None, ctx)
+
+    return parse
+
+
+def _parse_event(line: str, regex: re.Pattern, sentinels: re.Pattern,
+                 player_name: Optional[str], ctx: Optional[ParserContext]) -> Optional[GameEvent]:
     if not line or len(line) < 10:
         return None
 
-    timestamp = extract_timestamp(line)
+    # Cheap literal prefilter: the vast majority of Game.log lines are noise
+    if not sentinels.search(line):
+        return None
 
-    # ─── Actor Death ───
-    match = RE_ACTOR_DEATH.search(line)
+    match = regex.match(line)
     if not match:
-        match = RE_ACTOR_DEATH_ALT.search(line)
+        return None
 
-    if match:
-        victim = match.group(1).strip()
-        killer = match.group(2).strip()
-        damage_type = match.group(3).strip() if match.lastindex >= 3 and match.group(3) else None
-        zone = match.group(4).strip() if match.lastindex >= 4 and match.group(4) else None
+    kind = match.lastgroup
+    base = regex.groupindex[kind]  # Group n of that pattern is base + n
+
+    def group(n: int) -> Optional[str]:
+        return match.group(base + n)
+
+    timestamp = extract_timestamp(line)
+    if ctx is None:
+        ctx = ParserContext(player_name)
+
+    # ─── Actor Death ───
+    if kind in ("actor_death", "actor_death_alt"):
+        victim = group(1).strip()
+        killer = group(2).strip()
+        damage_type = group(3).strip() if group(3) else None
+        zone = group(4).strip() if kind == "actor_death" and group(4) else None
 
         # Extract weapon if present
         weapon = None
@@ -234,10 +404,12 @@ def parse_line(line: str, player_name: Optional[str] = None) -> Optional[GameEve
             direction = dir_match.group(1)
 
         # Determine event type
-        player_lower = player_name.lower() if player_name else None
+        player_lower = ctx.player_lower
+        killer_lower = killer.lower()
+        victim_lower = victim.lower()
 
         # Suicide check
-        if killer.lower() == victim.lower():
+        if killer_lower == victim_lower:
             return GameEvent(
                 event_type=EventType.SUICIDE,
                 timestamp=timestamp,
@@ -246,24 +418,25 @@ def parse_line(line: str, player_name: Optional[str] = None) -> Optional[GameEve
                 victim=victim,
                 damage_type=damage_type,
                 ship=ship,
-                is_player_involved=(player_lower is not None and player_lower == killer.lower()),
+                is_player_involved=(player_lower is not None and player_lower == killer_lower),
             )
 
         # Determine kill type based on player involvement + NPC status
-        is_killer_player_char = player_lower and killer.lower() == player_lower
-        is_victim_player_char = player_lower and victim.lower() == player_lower
+        is_killer_player_char = player_lower and killer_lower == player_lower
+        is_victim_player_char = player_lower and victim_lower == player_lower
 
         if is_victim_player_char:
             # Player died
             event_type = EventType.DEATH
         elif is_killer_player_char:
             # Player got a kill
-            event_type = EventType.PVE_KILL if is_npc(victim) else EventType.PVP_KILL
+            event_type = EventType.PVE_KILL if is_npc(victim, victim_lower) else EventType.PVP_KILL
         else:
             # Someone else died — still show it
-            if is_npc(victim):
+            victim_is_npc = is_npc(victim, victim_lower)
+            if victim_is_npc:
                 event_type = EventType.PVE_KILL
-            elif is_npc(killer) and is_npc(victim):
+            elif is_npc(killer, killer_lower) and victim_is_npc:
                 return None  # NPC vs NPC, skip
             else:
                 event_type = EventType.DEATH_OTHER
@@ -283,11 +456,10 @@ def parse_line(line: str, player_name: Optional[str] = None) -> Optional[GameEve
         )
 
     # ─── Vehicle Destruction ───
-    match = RE_VEHICLE_DESTROY.search(line)
-    if match:
-        vehicle_id = match.group(1)
-        level_from = match.group(2)
-        level_to = match.group(3)
+    if kind == "vehicle_destroy":
+        vehicle_id = group(1)
+        level_from = group(2)
+        level_to = group(3)
 
         vehicle_name = extract_ship_name(vehicle_id) or vehicle_id
         destruction = "full" if level_to == "2" else "soft"
@@ -300,9 +472,8 @@ def parse_line(line: str, player_name: Optional[str] = None) -> Optional[GameEve
             destruction_level=destruction,
         )
 
-    match = RE_VEHICLE_DESTROY_ALT.search(line)
-    if match and "<Vehicle Destruction>" in line:
-        vehicle_id = match.group(1)
+    if kind == "vehicle_destroy_alt":
+        vehicle_id = group(1)
         vehicle_name = extract_ship_name(vehicle_id) or vehicle_id
         return GameEvent(
             event_type=EventType.VEHICLE_DESTROYED,
@@ -313,22 +484,20 @@ def parse_line(line: str, player_name: Optional[str] = None) -> Optional[GameEve
         )
 
     # ─── Corpse ───
-    match = RE_CORPSE.search(line)
-    if match:
-        name = match.group(1)
+    if kind == "corpse":
+        name = group(1)
         return GameEvent(
             event_type=EventType.CORPSE,
             timestamp=timestamp,
             raw_line=line,
             victim=name,
-            is_player_involved=(player_name and name.lower() == player_name.lower()),
+            is_player_involved=(ctx.player_name and name.lower() == ctx.player_lower),
         )
 
     # ─── Jump Drive ───
-    match = RE_JUMP.search(line)
-    if match:
-        from_state = match.group(1)
-        to_state = match.group(2)
+    if kind == "jump":
+        from_state = group(1)
+        to_state = group(2)
         return GameEvent(
             event_type=EventType.JUMP,
             timestamp=timestamp,
@@ -337,7 +506,7 @@ def parse_line(line: str, player_name: Optional[str] = None) -> Optional[GameEve
         )
 
     # ─── Disconnect ───
-    if RE_DISCONNECT.search(line):
+    if kind == "disconnect":
         return GameEvent(
             event_type=EventType.DISCONNECT,
             timestamp=timestamp,
@@ -345,21 +514,21 @@ def parse_line(line: str, player_name: Optional[str] = None) -> Optional[GameEve
         )
 
     # ─── Actor Stall ───
-    if RE_STALL.search(line):
-        return GameEvent(
-            event_type=EventType.ACTOR_STALL,
-            timestamp=timestamp,
-            raw_line=line,
-        )
-
-    return None
-
-
-def parse_lines(lines: List[str], player_name: Optional[str] = None) -> List[GameEvent]:
-    """Parse multiple log lines. Returns list of events (no Nones)."""
+    return GameEvent(
+        event_type=EventType.ACTOR_STALL,
+        timestamp=timestamp,
+        raw_line=line,
+    )
+
+
+def parse_lines(lines: List[str], player_name: Optional[str] = None,
+                ctx: Optional[ParserContext] = None) -> List[GameEvent]:
+    """Parse multiple log lines, already stripped like parse_line's. Returns list of events (no Nones)."""
+    if ctx is None:
+        ctx = ParserContext(player_name)
     events = []
     for line in lines:
-        event = parse_line(line.strip(), player_name)
+        event = parse_line(line, ctx=ctx)
         if event:
             events.append(event)
     return events
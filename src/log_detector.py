@@ -7,7 +7,12 @@ Supports LIVE, PTU, EPTU environments.
 
 import os
 import platform
+import re
+import stat
+import threading
+import time
 import glob
+from operator import itemgetter
 from typing import List, Tuple, Optional
 
 
@@ -21,6 +26,29 @@ SC_SUBDIRS = [
     os.path.join("steamapps", "common", "Star Citizen", "PTU"),
 ]
 
+def _version_label(subdir: str) -> str:
+    """Environment label (LIVE, PTU or EPTU) for an install subdirectory."""
+    # The environment is the subdir's last path component, matched whole
+    env = os.path.basename(subdir).upper()
+    return env if env in ("PTU", "EPTU") else "LIVE"
+
+
+def _build_subdir_tree(subdirs: List[str]) -> dict:
+    """Nest subdirs by path component; each leaf maps to its version label."""
+    tree = {}
+    for subdir in subdirs:
+        *parents, leaf = subdir.split(os.sep)
+        node = tree
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = _version_label(subdir)
+    return tree
+
+
+# SC_SUBDIRS as a tree, so shared parents ("Roberts Space Industries",
+# "steamapps", ...) are probed once per root, built once
+SC_SUBDIR_TREE = _build_subdir_tree(SC_SUBDIRS)
+
 # Common base directories to check on each drive
 COMMON_BASES = [
     "",          # Drive root
@@ -29,19 +57,65 @@ COMMON_BASES = [
     "Program Files (x86)",
 ]
 
+# GetDriveTypeW result for CD/DVD drives
+DRIVE_CDROM = 5
+
+# Seconds to wait for drive scans; drives still probing after this (hung
+# network or removable mounts) are left out of the result
+DRIVE_SCAN_TIMEOUT = 2.0
+
+# Seconds a find_game_logs result is reused, provided none of the logs it
+# found has changed on disk since
+SCAN_CACHE_TTL = 5.0
+
+# Last scan: monotonic time, result, and (mtime, size) of each log found
+_scan_cache = {"ts": None, "result": [], "sig": ()}
+
+# Player handle in login lines, matched on the raw head of the log
+# (the nickname gap may not span lines)
+RE_CHARACTER_NAME = re.compile(rb'm_characterName=(\S+)')
+RE_NICKNAME = re.compile(rb'SetNickname[^\S\n]+(\S+)')
+
+# How much of the log start extract_player_name reads; login info comes
+# early and 1 MB covers several thousand lines
+PLAYER_NAME_SCAN_BYTES = 1 << 20
+
 # Wine/Proton paths for Linux
 LINUX_WINE_PATHS = [
     os.path.expanduser("~/.wine/drive_c"),
     os.path.expanduser("~/Games/star-citizen/drive_c"),
 ]
 
+# Where the launcher installs by default (natively, or in the usual Wine
+# prefixes); find_most_recent_log checks these before a full drive scan
+if platform.system() == "Windows":
+    COMMON_INSTALL_ROOTS = ["C:\\Program Files"]
+else:
+    COMMON_INSTALL_ROOTS = [os.path.join(prefix, "Program Files") for prefix in LINUX_WINE_PATHS]
+
 
 def get_drives() -> List[str]:
     """Get all mounted drive roots for the current OS."""
     system = platform.system()
 
     if system == "Windows":
+        try:
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+        except (ImportError, AttributeError):
+            kernel32 = None
+
         drives = []
+        if kernel32 is not None:
+            # One GetLogicalDrives bitmask instead of probing 26 letters;
+            # optical drives are skipped so an empty tray is never touched
+            mask = kernel32.GetLogicalDrives()
+            for i, letter in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZ"):
+                drive = f"{letter}:\\"
+                if mask & (1 << i) and kernel32.GetDriveTypeW(drive) != DRIVE_CDROM:
+                    drives.append(drive)
+            return drives
+
         for letter in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
             drive = f"{letter}:\\"
             if os.path.exists(drive):
@@ -53,10 +127,10 @@ def get_drives() -> List[str]:
         paths = ["/"]
         for mount_base in ["/mnt", "/media"]:
             if os.path.isdir(mount_base):
-                for entry in os.listdir(mount_base):
-                    full = os.path.join(mount_base, entry)
-                    if os.path.isdir(full):
-                        paths.append(full)
+                # DirEntry.is_dir() answers from the directory listing for
+                # plain directories, without a stat per entry
+                with os.scandir(mount_base) as entries:
+                    paths.extend(entry.path for entry in entries if entry.is_dir())
         # Add Wine/Proton paths
         paths.extend([p for p in LINUX_WINE_PATHS if os.path.isdir(p)])
         return paths
@@ -65,51 +139,125 @@ def get_drives() -> List[str]:
         paths = ["/"]
         volumes = "/Volumes"
         if os.path.isdir(volumes):
-            for entry in os.listdir(volumes):
-                paths.append(os.path.join(volumes, entry))
+            with os.scandir(volumes) as entries:
+                paths.extend(entry.path for entry in entries)
         return paths
 
     return ["/"]
 
 
+def _scan_drive(drive: str) -> List[Tuple[float, Tuple[str, str, str]]]:
+    """Probe one drive's install roots. Returns (mtime, log entry) pairs."""
+    found = []
+    for base in COMMON_BASES:
+        root = os.path.join(drive, base)
+        # Most bases don't exist on a given drive; skip all their subdirs
+        if os.path.isdir(root):
+            found.extend(_scan_root(root))
+    return found
+
+
+def _scan_root(root: str) -> List[Tuple[float, Tuple[str, str, str]]]:
+    """Probe the known SC subdirs under one install root."""
+    found = []
+    _probe_tree(root, SC_SUBDIR_TREE, found)
+    return found
+
+
+def _probe_tree(path: str, tree: dict, found: list):
+    for name, node in tree.items():
+        child = os.path.join(path, name)
+        if isinstance(node, dict):
+            # A missing directory rules out every install below it
+            if os.path.isdir(child):
+                _probe_tree(child, node, found)
+            continue
+        log_file = os.path.join(child, "Game.log")
+        try:
+            st = os.stat(log_file)
+        except OSError:
+            continue
+        if stat.S_ISREG(st.st_mode):
+            # Keep the mtime from this stat for sorting by the caller
+            found.append((st.st_mtime, (node, log_file, child)))
+
+
 def find_game_logs() -> List[Tuple[str, str, str]]:
     """
     Scan all drives for Star Citizen Game.log files.
 
     Returns list of (version_label, log_path, install_dir) tuples,
-    sorted by modification time (newest first).
+    sorted by modification time (newest first). A scan from the last
+    SCAN_CACHE_TTL seconds is reused if none of its logs has changed.
     """
+    cached = _scan_cache["result"]
+    if (_scan_cache["ts"] is not None
+            and time.monotonic() - _scan_cache["ts"] < SCAN_CACHE_TTL
+            and _log_signature(cached) == _scan_cache["sig"]):
+        return list(cached)
+
     found = []
     seen_paths = set()
 
     drives = get_drives()
 
-    for drive in drives:
-        for base in COMMON_BASES:
-            for subdir in SC_SUBDIRS:
-                candidate = os.path.join(drive, base, subdir)
-                log_file = os.path.join(candidate, "Game.log")
+    # Drives are probed in parallel: the scan takes as long as the slowest
+    # drive rather than the sum, and a hung mount is cut off by the timeout.
+    # Daemon threads, so a probe stuck in the OS never holds up exit.
+    results = [None] * len(drives)
 
-                if os.path.isfile(log_file) and log_file not in seen_paths:
-                    seen_paths.add(log_file)
-                    # Determine version label from path
-                    version = "LIVE"
-                    path_upper = candidate.upper()
-                    if "EPTU" in path_upper:
-                        version = "EPTU"
-                    elif "PTU" in path_upper:
-                        version = "PTU"
+    def probe(index, drive):
+        results[index] = _scan_drive(drive)
 
-                    found.append((version, log_file, candidate))
+    threads = [threading.Thread(target=probe, args=(i, drive), daemon=True)
+               for i, drive in enumerate(drives)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + DRIVE_SCAN_TIMEOUT
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+
+    for drive, drive_found in zip(drives, results):
+        if drive_found is None:
+            print(f"[Detector] Skipping unresponsive drive: {drive}")
+            continue
+        for mtime, entry in drive_found:
+            if entry[1] not in seen_paths:
+                seen_paths.add(entry[1])
+                found.append((mtime, entry))
 
     # Sort by file modification time, newest first
-    found.sort(key=lambda x: os.path.getmtime(x[1]) if os.path.exists(x[1]) else 0, reverse=True)
+    found.sort(key=itemgetter(0), reverse=True)
 
-    return found
+    result = [entry for _mtime, entry in found]
+    _scan_cache.update(ts=time.monotonic(), result=result, sig=_log_signature(result))
+    return list(result)
+
+
+def _log_signature(logs: List[Tuple[str, str, str]]) -> tuple:
+    """(mtime, size) of each log path, or None for one that is gone."""
+    sig = []
+    for _version, log_file, _install_dir in logs:
+        try:
+            st = os.stat(log_file)
+            sig.append((st.st_mtime, st.st_size))
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
 
 
 def find_most_recent_log() -> Optional[str]:
-    """Find the most recently modified Game.log. Returns path or None."""
+    """
+    Find the most recently modified Game.log. Returns path or None.
+
+    Default install locations are tried first and the newest log there
+    wins; only if none has a log are all drives scanned (find_game_logs,
+    which stays exhaustive).
+    """
+    found = [hit for root in COMMON_INSTALL_ROOTS for hit in _scan_root(root)]
+    if found:
+        return max(found, key=itemgetter(0))[1][1]
+
     logs = find_game_logs()
     if logs:
         return logs[0][1]
@@ -125,24 +273,34 @@ def extract_player_name(log_path: str) -> Optional[str]:
         return None
 
     try:
-        with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
-            # Only read first 5000 lines to find login info
-            for i, line in enumerate(f):
-                if i > 5000:
-                    break
-                # Pattern: <AccountLoginCharacterStatus> ... Character: PlayerName ...
-                if "m_loginId=" in line and "m_characterName=" in line:
-                    # Try to extract character name
-                    import re
-                    match = re.search(r'm_characterName=(\S+)', line)
-                    if match:
-                        return match.group(1)
-                # Alternative: "Login - Character:" pattern
-                if "SetNickname" in line:
-                    import re
-                    match = re.search(r'SetNickname\s+(\S+)', line)
-                    if match:
-                        return match.group(1)
+        # One block read and two regex passes over it instead of a Python
+        # loop per line; only the matched name is decoded
+        with open(log_path, "rb") as f:
+            head = f.read(PLAYER_NAME_SCAN_BYTES)
+        if len(head) == PLAYER_NAME_SCAN_BYTES:
+            head = head[:head.rfind(b"\n") + 1]  # Drop a cut-off last line
+
+        # Pattern: <AccountLoginCharacterStatus> ... Character: PlayerName ...
+        # The same line must also carry m_loginId=
+        character = None
+        for match in RE_CHARACTER_NAME.finditer(head):
+            line_start = head.rfind(b"\n", 0, match.start()) + 1
+            line_end = head.find(b"\n", match.end())
+            if head.find(b"m_loginId=", line_start, line_end if line_end != -1 else len(head)) != -1:
+                character = match
+                break
+        # Alternative: "Login - Character:" pattern
+        nickname = RE_NICKNAME.search(head)
+
+        # Whichever comes first in the log wins; on a shared line, the
+        # character name does
+        if character and nickname:
+            nickname_line_start = head.rfind(b"\n", 0, nickname.start()) + 1
+            if nickname_line_start < line_start:
+                character = None
+        match = character or nickname
+        if match:
+            return match.group(1).decode("utf-8", errors="ignore")
     except Exception as e:
         print(f"[Detector] Error extracting player name: {e}")
 
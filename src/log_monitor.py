@@ -6,21 +6,47 @@ Emits new lines via Qt signals for thread-safe UI updates.
 """
 
 import os
-from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+import stat
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal, pyqtSlot
+
+
+# Delay between a change notification and the read, so a burst of writes
+# is picked up in one poll
+CHANGE_DEBOUNCE_MS = 50
+
+# Keep the log open between polls instead of reopening it for every read.
+# Not on Windows: an open handle there stops the game from moving Game.log
+# into logbackups when a new session starts.
+KEEP_HANDLE_OPEN = os.name != "nt"
 
 
 class LogMonitor(QObject):
     """Watches a log file for new lines and emits them as signals."""
 
-    new_line = pyqtSignal(str)       # Emitted for each new line
+    new_line = pyqtSignal(str)       # Emitted for each new line (only if connected)
+    new_lines = pyqtSignal(list)     # Emitted once per read with all its new lines
     file_reset = pyqtSignal()         # Emitted when the file is truncated/recreated
     monitoring_started = pyqtSignal(str)  # Emitted with filepath when monitoring begins
 
-    def __init__(self, poll_interval_ms: int = 500, parent=None):
+    def __init__(self, poll_interval_ms: int = 5000, parent=None):
         super().__init__(parent)
         self._filepath = None
         self._file_offset = 0
-        self._file_size = 0
+        self._fh = None  # See KEEP_HANDLE_OPEN
+        self._fh_id = None  # (st_ino, st_dev) of the file _fh has open
+        self._last_mtime_ns = None  # Log mtime as of the last poll
+        self._tail = b""  # Read but unterminated last line, completed by a later read
+        # Change notifications drive the reads; the timer is only a slow
+        # fallback for platforms/filesystems where they are late or missing
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        # The log's directory too, so a Game.log recreated by a new session
+        # is picked up on its creation rather than at the next fallback poll
+        self._watcher.directoryChanged.connect(self._on_file_changed)
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(CHANGE_DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._poll)
         self._timer = QTimer(self)
         self._timer.timeout.connect(self._poll)
         self._poll_interval = poll_interval_ms
@@ -29,12 +55,17 @@ class LogMonitor(QObject):
     def filepath(self) -> str:
         return self._filepath
 
+    @pyqtSlot(str, bool)
     def start(self, filepath: str, read_existing: bool = False):
         """Start monitoring a log file."""
         self.stop()
         self._filepath = filepath
 
-        if not os.path.isfile(filepath):
+        try:
+            file_stat = os.stat(filepath)
+        except OSError:
+            file_stat = None
+        if file_stat is None or not stat.S_ISREG(file_stat.st_mode):
             print(f"[Monitor] File not found: {filepath}")
             return
 
@@ -42,50 +73,117 @@ class LogMonitor(QObject):
             self._file_offset = 0
         else:
             # Start from end of file
-            self._file_offset = os.path.getsize(filepath)
+            self._file_offset = file_stat.st_size
 
-        self._file_size = os.path.getsize(filepath)
         self.monitoring_started.emit(filepath)
+        self._watcher.addPaths([filepath, os.path.dirname(os.path.abspath(filepath))])
         self._timer.start(self._poll_interval)
         print(f"[Monitor] Watching: {filepath} (offset: {self._file_offset})")
 
+    @pyqtSlot()
     def stop(self):
         """Stop monitoring."""
         self._timer.stop()
+        self._debounce.stop()
+        watched = self._watcher.files() + self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+        self._close_handle()
         self._filepath = None
         self._file_offset = 0
+        self._tail = b""
+        self._last_mtime_ns = None
 
+    @pyqtSlot()
     def reprocess(self):
         """Re-read the entire log file from the beginning."""
         if self._filepath:
             self._file_offset = 0
+            self._tail = b""  # A partial line from before the rewind
+            self._last_mtime_ns = None
             self._poll()
 
+    def _on_file_changed(self, _path: str):
+        if not self._debounce.isActive():
+            self._debounce.start()
+
     def _poll(self):
         """Check for new data in the log file."""
-        if not self._filepath or not os.path.isfile(self._filepath):
+        if not self._filepath:
+            return
+
+        try:
+            path_stat = os.stat(self._filepath)
+        except OSError:
+            return  # Missing for now, e.g. while the game rotates it
+
+        # The watcher drops a file that was replaced (new session, atomic save)
+        if self._filepath not in self._watcher.files():
+            self._watcher.addPath(self._filepath)
+
+        # Nothing appended or rewritten since the last poll: the common case
+        # costs just the one stat above
+        if path_stat.st_size == self._file_offset and path_stat.st_mtime_ns == self._last_mtime_ns:
             return
+        self._last_mtime_ns = path_stat.st_mtime_ns
 
         try:
-            current_size = os.path.getsize(self._filepath)
+            if self._fh is not None:
+                if (path_stat.st_ino, path_stat.st_dev) != self._fh_id:
+                    # A new file at the same path (new game session)
+                    self._close_handle()
+                    self._file_offset = 0
+                    self._tail = b""
+                    self.file_reset.emit()
+
+            current_size = path_stat.st_size
 
             # File was truncated or recreated (new game session)
             if current_size < self._file_offset:
                 self._file_offset = 0
+                self._tail = b""
                 self.file_reset.emit()
 
             if current_size > self._file_offset:
-                with open(self._filepath, "r", encoding="utf-8", errors="ignore") as f:
-                    f.seek(self._file_offset)
-                    new_data = f.read()
-                    self._file_offset = f.tell()
-
-                for line in new_data.splitlines():
-                    line = line.strip()
-                    if line:
-                        self.new_line.emit(line)
-
-            self._file_size = current_size
+                chunk = self._read_from(self._file_offset)
+                self._file_offset += len(chunk)
+                new_data = self._tail + chunk if self._tail else chunk
+
+                # Only complete lines are emitted; a line still being
+                # written is kept in memory until its newline arrives
+                end = new_data.rfind(b"\n") + 1
+                self._tail = new_data[end:]
+                new_text = new_data[:end].decode("utf-8", errors="ignore")
+
+                # Lines are stripped once, here; consumers such as
+                # parse_line take them as-is
+                lines = [line for line in map(str.strip, new_text.splitlines()) if line]
+                if lines:
+                    # One signal per read rather than one per line
+                    self.new_lines.emit(lines)
+                    if self.receivers(self.new_line):
+                        for line in lines:
+                            self.new_line.emit(line)
 
         except Exception as e:
             print(f"[Monitor] Poll error: {e}")
+
+    def _read_from(self, offset: int) -> bytes:
+        """Read everything from offset to the end of the log."""
+        # Binary read: offsets are plain byte positions, and the new data
+        # is decoded in one call rather than through a text layer
+        if not KEEP_HANDLE_OPEN:
+            with open(self._filepath, "rb") as f:
+                f.seek(offset)
+                return f.read()
+        if self._fh is None:
+            self._fh = open(self._filepath, "rb")
+            handle_stat = os.fstat(self._fh.fileno())
+            self._fh_id = (handle_stat.st_ino, handle_stat.st_dev)
+        self._fh.seek(offset)
+        return self._fh.read()
+
+    def _close_handle(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
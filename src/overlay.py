@@ -6,25 +6,46 @@ Shows a live kill/death feed, session stats, and event log on top of the game.
 """
 
 import os
+import queue
 import sys
+import threading
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QLabel,
-    QScrollArea, QFileDialog, QMenu, QSystemTrayIcon, QSlider, QLineEdit,
+    QPlainTextEdit, QFileDialog, QMenu, QSystemTrayIcon, QSlider, QLineEdit,
     QPushButton, QCheckBox, QDialog, QFormLayout, QDialogButtonBox,
     QFrame, QToolTip,
 )
 from PyQt6.QtGui import (
-    QAction, QIcon, QFont, QColor, QPainter, QPainterPath, QCursor,
-    QKeySequence, QShortcut,
+    QAction, QIcon, QFont, QColor, QPainter, QPainterPath, QCursor, QPixmap,
+    QKeySequence, QShortcut, QTextCharFormat, QTextCursor,
+)
+from PyQt6.QtCore import (
+    Qt, QPoint, QSize, QTimer, QEvent, QMetaObject, QThread, QObject, QRunnable,
+    QThreadPool, pyqtSignal,
 )
-from PyQt6.QtCore import Qt, QPoint, QSize, QTimer, QEvent, pyqtSignal
 
-from src.config import Config
-from src.event_parser import EventType, GameEvent, parse_line
+from src.config import Config, write_config
+from src.event_parser import EventType, GameEvent, build_parser
 from src.log_monitor import LogMonitor
+from src.parse_worker import ParseWorker
 from src.log_detector import find_game_logs, find_most_recent_log, extract_player_name
 
 
+# Incoming lines are queued and applied to the feed at most once per frame
+FEED_FLUSH_MS = 16
+
+# Config changes are saved this long after the last one, so a drag, a
+# held shortcut or a detect-then-start sequence writes the file once
+CONFIG_SAVE_DELAY_MS = 500
+
+# Restyles from the opacity/font shortcuts are coalesced to one per interval,
+# so holding a key repaints the whole window at most that often
+RESTYLE_DELAY_MS = 50
+
+
 # ─── Color Scheme ──────────────────────────────────────────────────────────
 
 COLORS = {
@@ -60,58 +81,257 @@ ICONS = {
 }
 
 
-def format_event(event: GameEvent, player_name: str = None) -> str:
-    """Format a GameEvent into a human-readable one-liner for the feed."""
-    icon = ICONS.get(event.event_type, "•")
-    t = event.timestamp
-    pn = player_name.lower() if player_name else ""
+def _fmt_death(event: GameEvent, icon: str, t: str, pn: str) -> str:
+    killer_display = event.killer or "Unknown"
+    extra = f" ({event.damage_type})" if event.damage_type else ""
+    ship = f" [{event.ship}]" if event.ship else ""
+    return f"{icon} {t}  {killer_display} killed YOU{extra}{ship}"
 
-    if event.event_type == EventType.DEATH:
-        killer_display = event.killer or "Unknown"
-        extra = f" ({event.damage_type})" if event.damage_type else ""
-        ship = f" [{event.ship}]" if event.ship else ""
-        return f"{icon} {t}  {killer_display} killed YOU{extra}{ship}"
 
-    if event.event_type in (EventType.PVP_KILL, EventType.PVE_KILL, EventType.FPS_KILL):
-        victim_display = event.victim or "Unknown"
-        weapon = f" ({event.weapon})" if event.weapon else ""
-        dtype = f" [{event.damage_type}]" if event.damage_type and not event.weapon else ""
-        ship = f" in {event.ship}" if event.ship else ""
+def _fmt_kill(event: GameEvent, icon: str, t: str, pn: str) -> str:
+    victim_display = event.victim or "Unknown"
+    weapon = f" ({event.weapon})" if event.weapon else ""
+    dtype = f" [{event.damage_type}]" if event.damage_type and not event.weapon else ""
+    ship = f" in {event.ship}" if event.ship else ""
 
-        if pn and event.killer and event.killer.lower() == pn:
-            return f"{icon} {t}  You killed {victim_display}{weapon}{dtype}{ship}"
-        else:
-            killer = event.killer or "Someone"
-            return f"{icon} {t}  {killer} killed {victim_display}{weapon}{dtype}{ship}"
+    if pn and event.killer and event.killer.lower() == pn:
+        return f"{icon} {t}  You killed {victim_display}{weapon}{dtype}{ship}"
+    else:
+        killer = event.killer or "Someone"
+        return f"{icon} {t}  {killer} killed {victim_display}{weapon}{dtype}{ship}"
+
+
+def _fmt_death_other(event: GameEvent, icon: str, t: str, pn: str) -> str:
+    return f"{icon} {t}  {event.killer or '?'} killed {event.victim or '?'}"
 
-    if event.event_type == EventType.DEATH_OTHER:
-        return f"{icon} {t}  {event.killer or '?'} killed {event.victim or '?'}"
 
-    if event.event_type == EventType.VEHICLE_DESTROYED:
-        level = "DESTROYED" if event.destruction_level == "full" else "disabled"
-        return f"{icon} {t}  {event.vehicle_name or 'Vehicle'} {level}"
+def _fmt_vehicle_destroyed(event: GameEvent, icon: str, t: str, pn: str) -> str:
+    level = "DESTROYED" if event.destruction_level == "full" else "disabled"
+    return f"{icon} {t}  {event.vehicle_name or 'Vehicle'} {level}"
 
-    if event.event_type == EventType.SUICIDE:
-        who = event.victim or "Someone"
-        if pn and who.lower() == pn:
-            who = "You"
-        return f"{icon} {t}  {who} committed suicide"
 
-    if event.event_type == EventType.CORPSE:
-        return f"{icon} {t}  Corpse: {event.victim or 'Unknown'}"
+def _fmt_suicide(event: GameEvent, icon: str, t: str, pn: str) -> str:
+    who = event.victim or "Someone"
+    if pn and who.lower() == pn:
+        who = "You"
+    return f"{icon} {t}  {who} committed suicide"
 
-    if event.event_type == EventType.JUMP:
-        return f"{icon} {t}  Quantum: {event.jump_state}"
 
-    if event.event_type == EventType.DISCONNECT:
-        return f"{icon} {t}  ⚠ DISCONNECTED"
+def _fmt_corpse(event: GameEvent, icon: str, t: str, pn: str) -> str:
+    return f"{icon} {t}  Corpse: {event.victim or 'Unknown'}"
 
-    if event.event_type == EventType.ACTOR_STALL:
-        return f"{icon} {t}  ⚠ Actor Stall"
 
+def _fmt_jump(event: GameEvent, icon: str, t: str, pn: str) -> str:
+    return f"{icon} {t}  Quantum: {event.jump_state}"
+
+
+def _fmt_disconnect(event: GameEvent, icon: str, t: str, pn: str) -> str:
+    return f"{icon} {t}  ⚠ DISCONNECTED"
+
+
+def _fmt_actor_stall(event: GameEvent, icon: str, t: str, pn: str) -> str:
+    return f"{icon} {t}  ⚠ Actor Stall"
+
+
+def _fmt_default(event: GameEvent, icon: str, t: str, pn: str) -> str:
     return f"• {t}  {event.raw_line[:80]}"
 
 
+# One formatter per event type, looked up instead of testing each type in turn
+_FORMATTERS = {
+    EventType.DEATH:             _fmt_death,
+    EventType.PVP_KILL:          _fmt_kill,
+    EventType.PVE_KILL:          _fmt_kill,
+    EventType.FPS_KILL:          _fmt_kill,
+    EventType.DEATH_OTHER:       _fmt_death_other,
+    EventType.VEHICLE_DESTROYED: _fmt_vehicle_destroyed,
+    EventType.SUICIDE:           _fmt_suicide,
+    EventType.CORPSE:            _fmt_corpse,
+    EventType.JUMP:              _fmt_jump,
+    EventType.DISCONNECT:        _fmt_disconnect,
+    EventType.ACTOR_STALL:       _fmt_actor_stall,
+}
+
+# Icon and formatter per event type, so formatting costs one lookup
+_EVENT_FORMAT = {
+    et: (ICONS.get(et, "•"), _FORMATTERS.get(et, _fmt_default))
+    for et in EventType
+}
+
+
+def format_event(event: GameEvent, player_name: str = None, player_lower: str = None) -> str:
+    """Format a GameEvent into a human-readable one-liner for the feed.
+    Callers formatting many events can pass the lowercased player name
+    as player_lower instead of player_name."""
+    if player_lower is not None:
+        pn = player_lower
+    else:
+        pn = player_name.lower() if player_name else ""
+    icon, formatter = _EVENT_FORMAT[event.event_type]
+    return formatter(event, icon, event.timestamp, pn)
+
+
+# Config flag that hides each filterable event type; the rest always show
+TYPE_FILTERS = {
+    EventType.PVP_KILL:          "show_pvp_kills",
+    EventType.PVE_KILL:          "show_pve_kills",
+    EventType.DEATH:             "show_deaths",
+    EventType.DEATH_OTHER:       "show_deaths",
+    EventType.FPS_DEATH:         "show_deaths",
+    EventType.VEHICLE_DESTROYED: "show_vehicle_destroyed",
+    EventType.JUMP:              "show_jumps",
+    EventType.CORPSE:            "show_corpses",
+    EventType.DISCONNECT:        "show_disconnects",
+    EventType.SUICIDE:           "show_suicides",
+}
+
+
+# Keyboard shortcut reference shown by Ctrl+H / the ? button
+HELP_TEXT = (
+    "╔═════════════════════════════════════════════╗\n"
+    "║   SQUIG-AI SC PARSE — KEYBOARD SHORTCUTS    ║\n"
+    "╠═════════════════════════════════════════════╣\n"
+    "║  Shift+F1          Toggle overlay           ║\n"
+    "║  Ctrl+,            Open settings            ║\n"
+    "║  Ctrl+O            Open log file            ║\n"
+    "║  Ctrl+L            Lock/unlock position     ║\n"
+    "║  Ctrl+P            Click-through mode       ║\n"
+    "║  Ctrl+K            Clear feed               ║\n"
+    "║  Ctrl+R            Reprocess log            ║\n"
+    "║  Ctrl+↑/↓          Adjust opacity           ║\n"
+    "║  Ctrl+Shift+↑/↓    Adjust font size        ║\n"
+    "║  Escape            Minimize                 ║\n"
+    "║  Right-click       Context menu             ║\n"
+    "╚═════════════════════════════════════════════╝"
+)
+
+
+# ─── Window Edges / Global Hotkeys ─────────────────────────────────────────
+
+# _get_resize_edge() result → edges for QWindow.startSystemResize
+RESIZE_EDGES = {
+    "L":  Qt.Edge.LeftEdge,
+    "R":  Qt.Edge.RightEdge,
+    "T":  Qt.Edge.TopEdge,
+    "B":  Qt.Edge.BottomEdge,
+    "LT": Qt.Edge.LeftEdge | Qt.Edge.TopEdge,
+    "LB": Qt.Edge.LeftEdge | Qt.Edge.BottomEdge,
+    "RT": Qt.Edge.RightEdge | Qt.Edge.TopEdge,
+    "RB": Qt.Edge.RightEdge | Qt.Edge.BottomEdge,
+}
+
+
+@lru_cache(maxsize=1)
+def _keyboard():
+    """The optional `keyboard` module, or None if it is not installed.
+    Imported on first use; a missing module is only looked for once."""
+    try:
+        import keyboard
+    except ImportError:
+        return None
+    return keyboard
+
+
+# ─── Stylesheet ────────────────────────────────────────────────────────────
+
+# Main window stylesheet, filled in by _apply_style (str.format_map)
+OVERLAY_STYLESHEET = """
+    #overlay_bg {{
+        background-color: #0a0a14{opacity_hex};
+        border: 1px solid #8b5cf640;
+        border-radius: 8px;
+    }}
+    #title_bar {{
+        background-color: #12121e;
+        border-top-left-radius: 8px;
+        border-top-right-radius: 8px;
+        border-bottom: 1px solid #8b5cf630;
+    }}
+    #title_text {{
+        color: #8b5cf6;
+        font-size: 13px;
+        font-weight: bold;
+        font-family: 'Segoe UI', 'Ubuntu', 'Cantarell', sans-serif;
+    }}
+    #stats_text {{
+        color: #aaaacc;
+        font-size: 11px;
+        font-family: 'Consolas', 'JetBrains Mono', 'Fira Code', monospace;
+    }}
+    #title_btn {{
+        background: transparent;
+        color: #888;
+        border: none;
+        border-radius: 4px;
+        font-size: 14px;
+    }}
+    #title_btn:hover {{
+        background: #ffffff15;
+        color: #ccc;
+    }}
+    #close_btn {{
+        background: transparent;
+        color: #888;
+        border: none;
+        border-radius: 4px;
+        font-size: 14px;
+    }}
+    #close_btn:hover {{
+        background: #ff444440;
+        color: #ff4444;
+    }}
+    #status_bar {{
+        color: #666;
+        font-size: 10px;
+        background: #0d0d1a80;
+        font-family: 'Consolas', 'JetBrains Mono', 'Fira Code', monospace;
+    }}
+    #feed_view {{
+        background: transparent;
+        border: none;
+        color: #cccccc;
+        font-size: {fs}px;
+        font-family: 'Consolas', 'JetBrains Mono', 'Fira Code', monospace;
+    }}
+    QScrollBar:vertical {{
+        background: transparent;
+        width: 6px;
+        margin: 0;
+    }}
+    QScrollBar::handle:vertical {{
+        background: #8b5cf640;
+        border-radius: 3px;
+        min-height: 20px;
+    }}
+    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
+        height: 0;
+    }}
+    #resize_grip {{
+        background: transparent;
+    }}
+"""
+
+
+# ─── Tray Icon ─────────────────────────────────────────────────────────────
+
+ACCENT_COLOR = QColor(139, 92, 246)     # Purple
+TRAY_TEXT_COLOR = QColor(255, 255, 255)
+
+@lru_cache(maxsize=1)
+def _build_tray_icon() -> QIcon:
+    """The tray icon, drawn on first use and reused afterwards.
+    Needs a QApplication, so it is built lazily rather than at import."""
+    # Create a simple colored icon programmatically
+    pixmap = QPixmap(32, 32)
+    pixmap.fill(ACCENT_COLOR)
+    painter = QPainter(pixmap)
+    painter.setPen(TRAY_TEXT_COLOR)
+    painter.setFont(QFont("sans-serif", 16, QFont.Weight.Bold))
+    painter.drawText(pixmap.rect(), Qt.AlignmentFlag.AlignCenter, "S")
+    painter.end()
+    return QIcon(pixmap)
+
+
 # ─── Settings Dialog ───────────────────────────────────────────────────────
 
 class SettingsDialog(QDialog):
@@ -215,6 +435,15 @@ class SettingsDialog(QDialog):
         """)
         layout.addWidget(buttons)
 
+    def refresh_from_config(self):
+        """Reload every field from config, for reopening the same dialog."""
+        self.player_input.setText(self.config.player_name or "")
+        self.opacity_slider.setValue(int(self.config.overlay.opacity * 100))
+        self.font_slider.setValue(self.config.overlay.font_size)
+        self.hotkey_input.setText(self.config.toggle_hotkey)
+        for attr, cb in self.filter_checks.items():
+            cb.setChecked(getattr(self.config, attr))
+
     def apply_to_config(self):
         """Write dialog values back to config."""
         self.config.player_name = self.player_input.text().strip() or None
@@ -226,18 +455,75 @@ class SettingsDialog(QDialog):
             setattr(self.config, attr, cb.isChecked())
 
 
+# ─── Background Log Scan ───────────────────────────────────────────────────
+
+class _ScanSignals(QObject):
+    finished = pyqtSignal(object)  # The scan function's return value
+
+
+class LogScan(QRunnable):
+    """Runs a log_detector scan on the global thread pool, so walking the
+    drives never blocks the UI; the result is delivered to `done` queued."""
+
+    def __init__(self, scan, done):
+        super().__init__()
+        self.setAutoDelete(False)  # Owned by the window until done runs
+        self._scan = scan
+        self.signals = _ScanSignals()
+        self.signals.finished.connect(done)
+
+    def run(self):
+        try:
+            result = self._scan()
+        except Exception as e:
+            print(f"[Overlay] Log scan failed: {e}")
+            result = None
+        self.signals.finished.emit(result)
+
+
 # ─── Main Overlay Window ──────────────────────────────────────────────────
 
 class OverlayWindow(QMainWindow):
     """The main transparent overlay window."""
 
+    # Requests to the LogMonitor, which runs on its own thread
+    request_monitor_start = pyqtSignal(str, bool)
+    request_reprocess = pyqtSignal()
+    request_parser = pyqtSignal(object, object)  # (parse_line, enabled types)
+
     def __init__(self, config: Config):
         super().__init__()
         self.config = config
         self.events: list[GameEvent] = []
         self.stats = {"kills": 0, "deaths": 0, "pve": 0}
+        self._player_lower = (config.player_name or "").lower()
+        self._enabled_types = self._compute_enabled()  # See TYPE_FILTERS
         self._locked = False          # Lock prevents drag/resize
         self._click_through = False   # Click-through passes input to game
+        self._style_key = None        # (opacity, font size) last applied
+        self._settings_dialog = None  # Created by open_settings
+        self._context_menu = None     # Created by contextMenuEvent
+        self._scan_job = None         # LogScan in flight, kept alive until done
+
+        # Deferred config save (see CONFIG_SAVE_DELAY_MS)
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(CONFIG_SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self._save_in_background)
+        # Writes happen on a single background thread; the config is
+        # serialized here on the UI thread, so the writer never reads it
+        self._save_queue = queue.Queue()
+        self._save_thread = threading.Thread(target=self._save_loop, daemon=True)
+        self._save_thread.start()
+        self._restyle_timer = QTimer(self)
+        self._restyle_timer.setSingleShot(True)
+        self._restyle_timer.setInterval(RESTYLE_DELAY_MS)
+        self._restyle_timer.timeout.connect(self._apply_style)
+
+        # Window background for paintEvent; the path follows the window
+        # size (resizeEvent) and the color the opacity (_apply_style)
+        self._bg_path = QPainterPath()
+        self._bg_color = QColor(10, 10, 20)
 
         # ─── Window flags for true overlay ───
         self._base_flags = (
@@ -334,20 +620,38 @@ class OverlayWindow(QMainWindow):
         root_layout.addWidget(self.status_label)
 
         # ─── Event feed ───
-        self.feed_scroll = QScrollArea()
-        self.feed_scroll.setWidgetResizable(True)
-        self.feed_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.feed_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        self.feed_scroll.setObjectName("feed_scroll")
-
-        self.feed_container = QWidget()
-        self.feed_layout = QVBoxLayout(self.feed_container)
-        self.feed_layout.setContentsMargins(6, 4, 6, 4)
-        self.feed_layout.setSpacing(2)
-        self.feed_layout.addStretch()
-
-        self.feed_scroll.setWidget(self.feed_container)
-        root_layout.addWidget(self.feed_scroll)
+        # Append-only text view: new entries are text blocks, and the
+        # block limit drops the oldest ones, with no per-entry widgets
+        self.feed_view = QPlainTextEdit()
+        self.feed_view.setObjectName("feed_view")
+        self.feed_view.setReadOnly(True)
+        self.feed_view.setUndoRedoEnabled(False)
+        self.feed_view.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.feed_view.setTextInteractionFlags(Qt.TextInteractionFlag.NoTextInteraction)
+        self.feed_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.feed_view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.feed_view.setMaximumBlockCount(max(1, config.overlay.max_feed_items))
+        self.feed_view.document().setDocumentMargin(6)
+
+        # Character format per event type, plain and highlighted
+        self._feed_formats = {}
+        for et, color in COLORS.items():
+            plain = QTextCharFormat()
+            plain.setForeground(QColor(color))
+            highlighted = QTextCharFormat(plain)
+            tint = QColor(color)
+            tint.setAlpha(0x18)  # Very subtle background tint
+            highlighted.setBackground(tint)
+            self._feed_formats[et] = (plain, highlighted)
+        self._system_format = QTextCharFormat()
+        self._system_format.setForeground(QColor("#8b5cf6"))
+
+        # Last feed entry and how many times in a row it was pushed
+        self._last_entry = None
+        self._last_format = None
+        self._repeat_count = 0
+
+        root_layout.addWidget(self.feed_view)
 
         # ─── Resize grip ───
         grip = QWidget()
@@ -361,18 +665,39 @@ class OverlayWindow(QMainWindow):
         # ─── Drag/resize state ───
         self._resize_margin = 10  # pixels from edge to trigger resize
 
-        # ─── Enable mouse tracking + event filter on ALL widgets recursively ───
-        self.setMouseTracking(True)
-        self._install_event_filter_recursive(central)
+        # ─── Event filter on the drag/resize handles only ───
+        # Presses elsewhere that no child accepts (labels, the feed) reach
+        # mousePressEvent on their own; filtering every widget would route
+        # all of their events through Python
+        self._drag_handles = (title_bar, grip)
+        for handle in self._drag_handles:
+            handle.installEventFilter(self)
 
         # ─── System tray icon (escape hatch for click-through mode) ───
         self._setup_tray_icon()
 
         # ─── Log monitor ───
-        self.monitor = LogMonitor(poll_interval_ms=500, parent=self)
-        self.monitor.new_line.connect(self._on_new_line)
+        # File I/O and parsing run on a worker thread so a slow disk or a
+        # reprocess never stalls painting; their signals arrive here queued
+        self._monitor_thread = QThread(self)
+        self.monitor = LogMonitor()
+        self.monitor.moveToThread(self._monitor_thread)
+        # Parser specialised to the current filters and player name
+        self._parse_worker = ParseWorker(build_parser(config), self._enabled_types)
+        self._parse_worker.moveToThread(self._monitor_thread)
+        self.request_monitor_start.connect(self.monitor.start)
+        self.request_reprocess.connect(self.monitor.reprocess)
+        self.request_parser.connect(self._parse_worker.configure)
+        self.monitor.new_lines.connect(self._parse_worker.parse_lines)
+        self._parse_worker.events.connect(self._on_events)
+        self._pending = deque()  # Events received but not yet applied to the feed
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(FEED_FLUSH_MS)
+        self._flush_timer.timeout.connect(self._flush_pending)
         self.monitor.file_reset.connect(self._on_file_reset)
         self.monitor.monitoring_started.connect(self._on_monitoring_started)
+        self._monitor_thread.start()
 
         # ─── In-app keyboard shortcuts (always work, no root needed) ───
         self._setup_shortcuts()
@@ -384,111 +709,26 @@ class OverlayWindow(QMainWindow):
         QTimer.singleShot(500, self._auto_start)
 
     def _apply_style(self):
-        opacity_hex = hex(int(self.config.overlay.opacity * 255))[2:].zfill(2)
-        fs = self.config.overlay.font_size
+        # Restyling re-polishes every widget; skip it when nothing changed
+        key = (self.config.overlay.opacity, self.config.overlay.font_size)
+        if key == self._style_key:
+            return
+        self._style_key = key
+        self._bg_color = QColor(10, 10, 20, int(self.config.overlay.opacity * 255))
 
-        self.setStyleSheet(f"""
-            #overlay_bg {{
-                background-color: #0a0a14{opacity_hex};
-                border: 1px solid #8b5cf640;
-                border-radius: 8px;
-            }}
-            #title_bar {{
-                background-color: #12121e;
-                border-top-left-radius: 8px;
-                border-top-right-radius: 8px;
-                border-bottom: 1px solid #8b5cf630;
-            }}
-            #title_text {{
-                color: #8b5cf6;
-                font-size: 13px;
-                font-weight: bold;
-                font-family: 'Segoe UI', 'Ubuntu', 'Cantarell', sans-serif;
-            }}
-            #stats_text {{
-                color: #aaaacc;
-                font-size: 11px;
-                font-family: 'Consolas', 'JetBrains Mono', 'Fira Code', monospace;
-            }}
-            #title_btn {{
-                background: transparent;
-                color: #888;
-                border: none;
-                border-radius: 4px;
-                font-size: 14px;
-            }}
-            #title_btn:hover {{
-                background: #ffffff15;
-                color: #ccc;
-            }}
-            #close_btn {{
-                background: transparent;
-                color: #888;
-                border: none;
-                border-radius: 4px;
-                font-size: 14px;
-            }}
-            #close_btn:hover {{
-                background: #ff444440;
-                color: #ff4444;
-            }}
-            #status_bar {{
-                color: #666;
-                font-size: 10px;
-                background: #0d0d1a80;
-                font-family: 'Consolas', 'JetBrains Mono', 'Fira Code', monospace;
-            }}
-            #feed_scroll {{
-                background: transparent;
-                border: none;
-            }}
-            QScrollBar:vertical {{
-                background: transparent;
-                width: 6px;
-                margin: 0;
-            }}
-            QScrollBar::handle:vertical {{
-                background: #8b5cf640;
-                border-radius: 3px;
-                min-height: 20px;
-            }}
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
-                height: 0;
-            }}
-            QLabel.feed_item {{
-                font-size: {fs}px;
-                font-family: 'Consolas', 'JetBrains Mono', 'Fira Code', monospace;
-                padding: 2px 4px;
-                border-radius: 3px;
-            }}
-            #resize_grip {{
-                background: transparent;
-            }}
-        """)
+        opacity_hex = hex(int(self.config.overlay.opacity * 255))[2:].zfill(2)
 
-    def _install_event_filter_recursive(self, widget):
-        """Install event filter and mouse tracking on widget and ALL children."""
-        widget.setMouseTracking(True)
-        widget.installEventFilter(self)
-        for child in widget.findChildren(QWidget):
-            child.setMouseTracking(True)
-            child.installEventFilter(self)
+        self.setStyleSheet(OVERLAY_STYLESHEET.format_map({
+            "opacity_hex": opacity_hex,
+            "fs": self.config.overlay.font_size,
+        }))
 
     def _setup_tray_icon(self):
         """Create a system tray icon as escape hatch for click-through mode.
         When the overlay is in ghost mode, the tray icon is the ONLY way
         to interact with the app (since all input passes through)."""
         self.tray_icon = QSystemTrayIcon(self)
-        # Create a simple colored icon programmatically
-        from PyQt6.QtGui import QPixmap
-        pixmap = QPixmap(32, 32)
-        pixmap.fill(QColor(139, 92, 246))  # Purple
-        painter = QPainter(pixmap)
-        painter.setPen(QColor(255, 255, 255))
-        painter.setFont(QFont("sans-serif", 16, QFont.Weight.Bold))
-        painter.drawText(pixmap.rect(), Qt.AlignmentFlag.AlignCenter, "S")
-        painter.end()
-        self.tray_icon.setIcon(QIcon(pixmap))
+        self.tray_icon.setIcon(_build_tray_icon())
         self.tray_icon.setToolTip("Squig-AI SC Parse — Right-click to unghost")
 
         tray_menu = QMenu()
@@ -537,16 +777,17 @@ class OverlayWindow(QMainWindow):
         """Setup global hotkey for toggle visibility.
         Uses the `keyboard` library which needs root on Linux.
         Falls back gracefully if unavailable."""
+        keyboard = _keyboard()
+        if keyboard is None:
+            print("[Overlay] 'keyboard' module not found — global hotkeys disabled")
+            print("[Overlay]   Install: pip install keyboard")
+            return
         try:
-            import keyboard
             keyboard.add_hotkey(self.config.toggle_hotkey, self._toggle_visibility)
             # Also register Shift+F2 globally to disable click-through
             # (since in-app shortcuts don't work in click-through mode)
             keyboard.add_hotkey("shift+f2", self._toggle_click_through)
             print(f"[Overlay] Global hotkeys: {self.config.toggle_hotkey}=toggle, shift+f2=click-through")
-        except ImportError:
-            print("[Overlay] 'keyboard' module not found — global hotkeys disabled")
-            print("[Overlay]   Install: pip install keyboard")
         except Exception as e:
             # On Linux without root, keyboard.add_hotkey raises
             print(f"[Overlay] Global hotkey failed: {e}")
@@ -571,7 +812,7 @@ class OverlayWindow(QMainWindow):
             "Ctrl+L":     self._toggle_lock,             # Lock/unlock position
             "Ctrl+P":     self._toggle_click_through,    # Click-through mode
             "Ctrl+K":     self._on_file_reset,           # Clear feed
-            "Ctrl+R":     lambda: self.monitor.reprocess() if self.monitor.filepath else None,
+            "Ctrl+R":     lambda: self.request_reprocess.emit() if self.monitor.filepath else None,
             "Ctrl+H":     self._show_help,               # Help overlay
             "Ctrl+Up":    lambda: self._adjust_opacity(+0.05),
             "Ctrl+Down":  lambda: self._adjust_opacity(-0.05),
@@ -606,8 +847,9 @@ class OverlayWindow(QMainWindow):
             self.passthru_btn.setToolTip("Disable click-through (Ctrl+P)")
             # Must re-show after changing flags
             self.show()
-            self._add_system_message("👻 Click-through ON")
-            self._add_system_message("   Click the  S  tray icon or right-click it to unghost")
+            with self._feed_batch():
+                self._add_system_message("👻 Click-through ON")
+                self._add_system_message("   Click the  S  tray icon or right-click it to unghost")
             # Flash the tray icon so user knows where to find it
             self.tray_icon.showMessage(
                 "Squig-AI SC Parse — Ghost Mode",
@@ -622,8 +864,9 @@ class OverlayWindow(QMainWindow):
         """Quick-adjust opacity without opening settings."""
         new_val = max(0.1, min(1.0, self.config.overlay.opacity + delta))
         self.config.overlay.opacity = round(new_val, 2)
-        self.config.save()
-        self._apply_style()
+        self._save_timer.start()
+        if not self._restyle_timer.isActive():
+            self._restyle_timer.start()
         pct = int(self.config.overlay.opacity * 100)
         self.status_label.setText(f"  Opacity: {pct}%")
 
@@ -631,30 +874,14 @@ class OverlayWindow(QMainWindow):
         """Quick-adjust font size without opening settings."""
         new_val = max(9, min(24, self.config.overlay.font_size + delta))
         self.config.overlay.font_size = new_val
-        self.config.save()
-        self._apply_style()
+        self._save_timer.start()
+        if not self._restyle_timer.isActive():
+            self._restyle_timer.start()
         self.status_label.setText(f"  Font: {new_val}px")
 
     def _show_help(self):
         """Show keyboard shortcuts help overlay."""
-        help_text = (
-            "╔═════════════════════════════════════════════╗\n"
-            "║   SQUIG-AI SC PARSE — KEYBOARD SHORTCUTS    ║\n"
-            "╠═════════════════════════════════════════════╣\n"
-            "║  Shift+F1          Toggle overlay           ║\n"
-            "║  Ctrl+,            Open settings            ║\n"
-            "║  Ctrl+O            Open log file            ║\n"
-            "║  Ctrl+L            Lock/unlock position     ║\n"
-            "║  Ctrl+P            Click-through mode       ║\n"
-            "║  Ctrl+K            Clear feed               ║\n"
-            "║  Ctrl+R            Reprocess log            ║\n"
-            "║  Ctrl+↑/↓          Adjust opacity           ║\n"
-            "║  Ctrl+Shift+↑/↓    Adjust font size        ║\n"
-            "║  Escape            Minimize                 ║\n"
-            "║  Right-click       Context menu             ║\n"
-            "╚═════════════════════════════════════════════╝"
-        )
-        self._add_system_message(help_text)
+        self._add_system_message(HELP_TEXT)
 
     def _show_about(self):
         """Show the Squig-AI About dialog."""
@@ -776,18 +1003,28 @@ class OverlayWindow(QMainWindow):
 
         # Auto-detect
         if self.config.auto_detect:
-            self.status_label.setText("  Scanning for Star Citizen...")
-            QApplication.processEvents()
-
-            log_path = find_most_recent_log()
-            if log_path:
-                self.config.log_path = log_path
-                self.config.save()
-                self._start_monitoring(log_path)
-                return
+            self._start_scan(find_most_recent_log, self._on_auto_start_scan)
+            return
 
         self.status_label.setText("  No log found — Right-click → Open Log File")
 
+    def _on_auto_start_scan(self, log_path):
+        self._scan_job = None
+        if log_path:
+            self.config.log_path = log_path
+            self._save_timer.start()
+            self._start_monitoring(log_path)
+            return
+        self.status_label.setText("  No log found — Right-click → Open Log File")
+
+    def _start_scan(self, scan, done):
+        """Run a log_detector scan in the background; done gets the result."""
+        if self._scan_job is not None:
+            return  # One scan at a time
+        self.status_label.setText("  Scanning for Star Citizen...")
+        self._scan_job = LogScan(scan, done)
+        QThreadPool.globalInstance().start(self._scan_job)
+
     def _start_monitoring(self, log_path: str):
         """Begin monitoring a log file."""
         # Try to detect player name
@@ -795,9 +1032,10 @@ class OverlayWindow(QMainWindow):
             name = extract_player_name(log_path)
             if name:
                 self.config.player_name = name
-                self.config.save()
+                self._save_timer.start()
+                self._update_parser()
 
-        self.monitor.start(log_path, read_existing=True)
+        self.request_monitor_start.emit(log_path, True)
 
     def _on_monitoring_started(self, filepath: str):
         short = os.path.basename(os.path.dirname(filepath))
@@ -808,28 +1046,67 @@ class OverlayWindow(QMainWindow):
 
     def _on_file_reset(self):
         """Log file was reset (new game session)."""
+        self._pending.clear()  # Events of the previous session
         self.events.clear()
         self.stats = {"kills": 0, "deaths": 0, "pve": 0}
         self._update_stats()
-        self._clear_feed()
-        self._add_system_message("── New Session ──")
-
-    def _on_new_line(self, line: str):
-        """Process a new log line."""
-        event = parse_line(line, self.config.player_name)
-        if not event:
-            return
-
-        # Filter based on config
-        if not self._should_show(event):
-            return
+        with self._feed_batch():
+            self._clear_feed()
+            self._add_system_message("── New Session ──")
+
+    def _on_events(self, events: list):
+        """Queue a batch of parsed events for the next flush."""
+        self._pending.extend(events)
+        # Single-shot rather than a free-running timer: nothing ticks while
+        # the log is idle
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush_pending(self):
+        """Apply every queued event to the feed in one pass."""
+        pending = self._pending
+        # Entries beyond the feed's block limit would be dropped as soon as
+        # they were added (e.g. on reprocess); those only update the stats
+        hidden = self._evicted_count(pending)
+        if hidden:
+            # A skipped entry sits between the feed's last block and the
+            # first one pushed, so the two must not collapse into ×N
+            self._last_entry = None
+        # One repaint and one scroll for everything queued this frame
+        with self._feed_batch():
+            while pending:
+                self._on_event(pending.popleft(), hidden > 0)
+                hidden -= 1
+        self._update_stats()
 
+    def _evicted_count(self, pending) -> int:
+        """How many of the oldest pending events the feed would evict at once.
+        Repeats collapse into one ×N block, so blocks are counted back from
+        the newest event. Events whose timestamp or format differ can never
+        share a block; counting only those changes never overestimates."""
+        limit = self.feed_view.maximumBlockCount()
+        if limit <= 0 or len(pending) <= limit:
+            return 0
+        formats = self._feed_formats
+        blocks = 0
+        last_key = None
+        for newer, event in enumerate(reversed(pending)):
+            key = (event.timestamp, formats[event.event_type][event.is_player_involved])
+            if key != last_key:
+                blocks += 1
+                if blocks > limit:
+                    return len(pending) - newer
+                last_key = key
+        return 0
+
+    def _on_event(self, event: GameEvent, stats_only: bool = False):
+        """Record a parsed event. The caller refreshes the stats label."""
         self.events.append(event)
 
         # Update stats
         if event.event_type in (EventType.PVP_KILL, EventType.FPS_KILL):
-            if event.is_player_involved and event.killer and self.config.player_name and \
-               event.killer.lower() == self.config.player_name.lower():
+            if event.is_player_involved and event.killer and self._player_lower and \
+               event.killer.lower() == self._player_lower:
                 self.stats["kills"] += 1
         elif event.event_type == EventType.PVE_KILL:
             if event.is_player_involved:
@@ -837,99 +1114,103 @@ class OverlayWindow(QMainWindow):
         elif event.event_type == EventType.DEATH:
             self.stats["deaths"] += 1
 
-        self._update_stats()
-        self._add_feed_item(event)
-
-        # Trim old events
-        max_items = self.config.overlay.max_feed_items
-        while self.feed_layout.count() > max_items + 1:  # +1 for stretch
-            item = self.feed_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-    def _should_show(self, event: GameEvent) -> bool:
-        """Check if event passes the user's filters."""
-        t = event.event_type
-        if t in (EventType.PVP_KILL,) and not self.config.show_pvp_kills:
-            return False
-        if t == EventType.PVE_KILL and not self.config.show_pve_kills:
-            return False
-        if t in (EventType.DEATH, EventType.DEATH_OTHER, EventType.FPS_DEATH) and not self.config.show_deaths:
-            return False
-        if t == EventType.VEHICLE_DESTROYED and not self.config.show_vehicle_destroyed:
-            return False
-        if t == EventType.JUMP and not self.config.show_jumps:
-            return False
-        if t == EventType.CORPSE and not self.config.show_corpses:
-            return False
-        if t == EventType.DISCONNECT and not self.config.show_disconnects:
-            return False
-        if t == EventType.SUICIDE and not self.config.show_suicides:
-            return False
-        return True
+        if not stats_only:
+            self._add_feed_item(event)
+
+    def _update_parser(self):
+        """Rebuild the parser and filters after the config changed."""
+        self._player_lower = (self.config.player_name or "").lower()
+        self._enabled_types = self._compute_enabled()
+        # Queued behind any batch already being parsed, so lines read
+        # before the change still use the old parser
+        self.request_parser.emit(build_parser(self.config), self._enabled_types)
+
+    def _compute_enabled(self) -> frozenset:
+        """Event types that pass the user's filters."""
+        return frozenset(
+            et for et in EventType
+            if et not in TYPE_FILTERS or getattr(self.config, TYPE_FILTERS[et])
+        )
 
     def _update_stats(self):
         k = self.stats["kills"]
         d = self.stats["deaths"]
         p = self.stats["pve"]
         kd = f"{k/d:.1f}" if d > 0 else f"{k}.0"
-        self.stats_label.setText(f"K:{k}  D:{d}  PvE:{p}  K/D:{kd}")
+        text = f"K:{k}  D:{d}  PvE:{p}  K/D:{kd}"
+        # setText relayouts the title bar even for identical text
+        if text != self.stats_label.text():
+            self.stats_label.setText(text)
 
     def _add_feed_item(self, event: GameEvent):
         """Add a formatted event to the feed."""
-        text = format_event(event, self.config.player_name)
-        color = COLORS.get(event.event_type, "#cccccc")
-
-        label = QLabel(text)
-        label.setProperty("class", "feed_item")
-        label.setWordWrap(True)
-        label.setTextFormat(Qt.TextFormat.PlainText)
-
+        text = format_event(event, player_lower=self._player_lower)
+        plain, highlighted = self._feed_formats[event.event_type]
         # Highlight events involving the player
-        if event.is_player_involved:
-            bg = color + "18"  # Very subtle background tint
-        else:
-            bg = "transparent"
-
-        label.setStyleSheet(f"""
-            color: {color};
-            font-size: {self.config.overlay.font_size}px;
-            font-family: 'Consolas', 'JetBrains Mono', 'Fira Code', monospace;
-            padding: 3px 6px;
-            border-radius: 3px;
-            background: {bg};
-        """)
-
-        # Insert before the stretch
-        idx = self.feed_layout.count() - 1
-        self.feed_layout.insertWidget(idx, label)
-
-        # Auto-scroll to bottom
-        QTimer.singleShot(50, lambda: self.feed_scroll.verticalScrollBar().setValue(
-            self.feed_scroll.verticalScrollBar().maximum()))
+        self._push_event(text, highlighted if event.is_player_involved else plain)
 
     def _add_system_message(self, text: str):
-        label = QLabel(text)
-        label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        label.setStyleSheet(f"""
-            color: #8b5cf6;
-            font-size: {self.config.overlay.font_size - 1}px;
-            font-family: 'Consolas', 'JetBrains Mono', 'Fira Code', monospace;
-            padding: 4px;
-        """)
-        idx = self.feed_layout.count() - 1
-        self.feed_layout.insertWidget(idx, label)
+        self._push_event(text, self._system_format)
+        self._scroll_to_bottom()
+
+    def _push_event(self, text: str, char_format: QTextCharFormat):
+        """Append an entry as a new block at the end of the feed.
+        An event entry identical to the last one bumps a ×N count on it
+        instead; system messages, which may span several blocks, never do."""
+        cursor = QTextCursor(self.feed_view.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        if text == self._last_entry and char_format is self._last_format:
+            self._repeat_count += 1
+            cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock,
+                                QTextCursor.MoveMode.KeepAnchor)
+            cursor.insertText(f"{text}  ×{self._repeat_count}", char_format)
+            return
+        # Only single-block event entries can be rewritten in place
+        collapsible = char_format is not self._system_format and "\n" not in text
+        self._last_entry = text if collapsible else None
+        self._last_format = char_format
+        self._repeat_count = 1
+        if not cursor.atStart():
+            cursor.insertBlock()
+        cursor.insertText(text, char_format)
+
+    @contextmanager
+    def _feed_batch(self):
+        """Group several feed changes into one repaint and one scroll."""
+        self.feed_view.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self.feed_view.setUpdatesEnabled(True)
+        self._scroll_to_bottom()
+
+    def _scroll_to_bottom(self):
+        bar = self.feed_view.verticalScrollBar()
+        bar.setValue(bar.maximum())
 
     def _clear_feed(self):
-        while self.feed_layout.count() > 1:  # Keep stretch
-            item = self.feed_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        self.feed_view.clear()
+        self._last_entry = None
 
     # ─── Context Menu ──────────────────────────────────────────────────────
 
     def contextMenuEvent(self, event):
-        menu = QMenu(self)
+        if self._context_menu is None:
+            self._build_context_menu()
+        # Only the two toggle entries change between openings
+        if self._locked:
+            self._lock_action.setText("🔒  Unlock Position            Ctrl+L")
+        else:
+            self._lock_action.setText("🔓  Lock Position               Ctrl+L")
+        if self._click_through:
+            self._ct_action.setText("👆  Disable Click-Through    Ctrl+P")
+        else:
+            self._ct_action.setText("👻  Click-Through Mode       Ctrl+P")
+        self._context_menu.exec(event.globalPos())
+
+    def _build_context_menu(self):
+        """Create the right-click menu once; contextMenuEvent reuses it."""
+        menu = self._context_menu = QMenu(self)
         menu.setStyleSheet("""
             QMenu {
                 background-color: #1a1a2e;
@@ -953,19 +1234,17 @@ class OverlayWindow(QMainWindow):
 
         # Reprocess
         reprocess_action = menu.addAction("🔄  Reprocess Log              Ctrl+R")
-        reprocess_action.triggered.connect(self.monitor.reprocess)
+        reprocess_action.triggered.connect(self.request_reprocess)
 
         menu.addSeparator()
 
-        # Lock position
-        lock_text = "🔒  Unlock Position            Ctrl+L" if self._locked else "🔓  Lock Position               Ctrl+L"
-        lock_action = menu.addAction(lock_text)
-        lock_action.triggered.connect(self._toggle_lock)
+        # Lock position (text set by contextMenuEvent)
+        self._lock_action = menu.addAction("")
+        self._lock_action.triggered.connect(self._toggle_lock)
 
-        # Click-through
-        ct_text = "👆  Disable Click-Through    Ctrl+P" if self._click_through else "👻  Click-Through Mode       Ctrl+P"
-        ct_action = menu.addAction(ct_text)
-        ct_action.triggered.connect(self._toggle_click_through)
+        # Click-through (text set by contextMenuEvent)
+        self._ct_action = menu.addAction("")
+        self._ct_action.triggered.connect(self._toggle_click_through)
 
         menu.addSeparator()
 
@@ -991,27 +1270,25 @@ class OverlayWindow(QMainWindow):
         quit_action = menu.addAction("✕  Quit")
         quit_action.triggered.connect(self.quit_app)
 
-        menu.exec(event.globalPos())
-
     def _choose_file(self):
         filepath, _ = QFileDialog.getOpenFileName(
             self, "Select Game.log File", "", "Log Files (*.log);;All Files (*)")
         if filepath:
             self.config.log_path = filepath
-            self.config.save()
+            self._save_timer.start()
             self._on_file_reset()
             self._start_monitoring(filepath)
 
     def _auto_detect_log(self):
-        self.status_label.setText("  Scanning for Star Citizen...")
-        QApplication.processEvents()
+        self._start_scan(find_game_logs, self._on_detect_scan)
 
-        logs = find_game_logs()
+    def _on_detect_scan(self, logs):
+        self._scan_job = None
         if logs:
             # If multiple, pick most recent
             version, log_path, install_dir = logs[0]
             self.config.log_path = log_path
-            self.config.save()
+            self._save_timer.start()
             self._on_file_reset()
             self._start_monitoring(log_path)
             self._add_system_message(f"Found {version} install")
@@ -1020,10 +1297,16 @@ class OverlayWindow(QMainWindow):
             self.status_label.setStyleSheet("color: #ff4444; font-size: 10px; background: #0d0d1a80;")
 
     def open_settings(self):
-        dialog = SettingsDialog(self.config, self)
+        # Built on first use and reused; its fields are reloaded each time
+        dialog = self._settings_dialog
+        if dialog is None:
+            dialog = self._settings_dialog = SettingsDialog(self.config, self)
+        else:
+            dialog.refresh_from_config()
         if dialog.exec() == QDialog.DialogCode.Accepted:
             dialog.apply_to_config()
-            self.config.save()
+            self._save_timer.start()
+            self._update_parser()
             self._apply_style()
             self._update_stats()
 
@@ -1034,11 +1317,11 @@ class OverlayWindow(QMainWindow):
     # These also work fine on X11, so this is fully cross-platform.
 
     def eventFilter(self, obj, event):
-        """Intercept left-click on child widgets → start native drag or resize."""
+        """Intercept left-click on the drag handles → start native drag or resize."""
+        if obj not in self._drag_handles:
+            return False
         if (event.type() == QEvent.Type.MouseButtonPress
                 and event.button() == Qt.MouseButton.LeftButton):
-            if isinstance(obj, QPushButton):
-                return False          # let buttons work
             if self._locked:
                 return False
             win_pos = self.mapFromGlobal(event.globalPosition().toPoint())
@@ -1069,18 +1352,7 @@ class OverlayWindow(QMainWindow):
 
     def _start_native_resize(self, edge_str):
         """Ask the compositor to begin a window resize on the given edge(s)."""
-        from PyQt6.QtCore import Qt as _Qt
-        edge_map = {
-            "L":  _Qt.Edge.LeftEdge,
-            "R":  _Qt.Edge.RightEdge,
-            "T":  _Qt.Edge.TopEdge,
-            "B":  _Qt.Edge.BottomEdge,
-            "LT": _Qt.Edge.LeftEdge | _Qt.Edge.TopEdge,
-            "LB": _Qt.Edge.LeftEdge | _Qt.Edge.BottomEdge,
-            "RT": _Qt.Edge.RightEdge | _Qt.Edge.TopEdge,
-            "RB": _Qt.Edge.RightEdge | _Qt.Edge.BottomEdge,
-        }
-        qt_edges = edge_map.get(edge_str)
+        qt_edges = RESIZE_EDGES.get(edge_str)
         if qt_edges:
             handle = self.windowHandle()
             if handle:
@@ -1092,15 +1364,40 @@ class OverlayWindow(QMainWindow):
         g = self.geometry()
         self.config.overlay.x = g.x()
         self.config.overlay.y = g.y()
-        self.config.save()
+        self._save_timer.start()
 
     def resizeEvent(self, event):
         """Save size after the compositor finishes resizing us."""
         super().resizeEvent(event)
+        self._bg_path = QPainterPath()
+        self._bg_path.addRoundedRect(0, 0, self.width(), self.height(), 8, 8)
         g = self.geometry()
         self.config.overlay.width = g.width()
         self.config.overlay.height = g.height()
-        self.config.save()
+        self._save_timer.start()
+
+    def _save_in_background(self):
+        self._save_queue.put(self.config.dumps())
+
+    def _save_loop(self):
+        """Config writer thread: writes the newest queued snapshot, until a
+        None arrives."""
+        while True:
+            items = [self._save_queue.get()]
+            # Only the newest snapshot matters; older ones are skipped
+            while True:
+                try:
+                    items.append(self._save_queue.get_nowait())
+                except queue.Empty:
+                    break
+            snapshots = [item for item in items if item is not None]
+            if snapshots:
+                try:
+                    write_config(snapshots[-1])
+                except Exception as e:
+                    print(f"[Config] Failed to save config: {e}")
+            if None in items:
+                return
 
     def _get_resize_edge(self, pos) -> str:
         m = self._resize_margin
@@ -1125,14 +1422,24 @@ class OverlayWindow(QMainWindow):
 
     def quit_app(self):
         """Clean shutdown."""
-        self.monitor.stop()
+        if self._monitor_thread.isRunning():
+            # stop() must run on the monitor's thread, which owns its timers
+            QMetaObject.invokeMethod(self.monitor, "stop", Qt.ConnectionType.BlockingQueuedConnection)
+            self._monitor_thread.quit()
+            self._monitor_thread.wait()
         if hasattr(self, 'tray_icon'):
             self.tray_icon.hide()
-        try:
-            import keyboard
-            keyboard.unhook_all()
-        except Exception:
-            pass
+        keyboard = _keyboard()
+        if keyboard is not None:
+            try:
+                keyboard.unhook_all()
+            except Exception:
+                pass
+        self._save_timer.stop()  # Pending changes are saved right here
+        self._save_queue.put(None)  # Let an in-flight write finish first
+        # Bounded, so a stalled disk can't hang exit; each write has its own
+        # temp file, so the final save below can't collide with this one
+        self._save_thread.join(timeout=0.5)
         self.config.save()
         QApplication.quit()
 
@@ -1145,10 +1452,7 @@ class OverlayWindow(QMainWindow):
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        path = QPainterPath()
-        path.addRoundedRect(0, 0, self.width(), self.height(), 8, 8)
-        opacity_int = int(self.config.overlay.opacity * 255)
-        painter.fillPath(path, QColor(10, 10, 20, opacity_int))
+        painter.fillPath(self._bg_path, self._bg_color)
         painter.end()
 
 
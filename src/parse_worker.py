@@ -0,0 +1,38 @@
+# Copyright (c) 2026 Squig-AI (squig-ai.com) — MIT License
+# See LICENSE file for details.
+"""
+Log line parsing off the GUI thread.
+Runs next to the LogMonitor and hands the overlay parsed, filtered events.
+"""
+
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+
+class ParseWorker(QObject):
+    """Turns batches of log lines into batches of GameEvents."""
+
+    events = pyqtSignal(list)  # Events from one batch of lines, in log order
+
+    def __init__(self, parse_line, enabled_types: frozenset, parent=None):
+        super().__init__(parent)
+        self._parse_line = parse_line  # From event_parser.build_parser
+        self._enabled_types = enabled_types
+
+    @pyqtSlot(object, object)
+    def configure(self, parse_line, enabled_types: frozenset):
+        """Switch to a new parser and filter set (settings or player changed)."""
+        self._parse_line = parse_line
+        self._enabled_types = enabled_types
+
+    @pyqtSlot(list)
+    def parse_lines(self, lines: list):
+        """Parse a batch of lines and emit the events that pass the filters."""
+        parse = self._parse_line
+        enabled = self._enabled_types
+        events = []
+        for line in lines:
+            event = parse(line)
+            if event is not None and event.event_type in enabled:
+                events.append(event)
+        if events:
+            self.events.emit(events)